@@ -1,21 +1,31 @@
 from .callbacks import LifecycleAware
-from .command import Command
+from .cancellation import CancellationToken
+from .command import Command, FusedCommand, fusable
 from .context import Context, CTX
 from .context import PipelineContextProvider
 from .exceptions import MissingRequirementsException
 from .exceptions import MissingRequirementsException
-from .pipeline import Pipeline
+from .pipeline import Pipeline, PipelineSession
+from .progress import ProgressReport, ProgressReporter
 from .sink import Sink
 from .source import Source
+from .spec import PipelineSpec
 
 __all__ = ['Context',
            'CTX',
            'LifecycleAware',
+           'CancellationToken',
            'CTX',
            'Command',
+           'FusedCommand',
+           'fusable',
            'PipelineContextProvider',
            'Source',
            'Sink',
            'Sink',
            'Pipeline',
+           'PipelineSpec',
+           'ProgressReport',
+           'ProgressReporter',
+           'PipelineSession',
            'MissingRequirementsException']
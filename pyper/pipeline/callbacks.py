@@ -1,7 +1,8 @@
 class LifecycleAware:
     """
     A class inheriting from this one indicates it has awareness for lifecycle. 'Setup' and 'cleanup' callbacks
-    will be invoked during construction/tear-down phases.
+    will be invoked during construction/tear-down phases. If execution fails, the 'failed' callback is invoked
+    right before the tear-down phase.
     """
 
     def setup(self):
@@ -15,3 +16,11 @@ class LifecycleAware:
         Called during the tear-down process of the pipeline.
         """
         pass
+
+    def failed(self, error: BaseException):
+        """
+        Called when pipeline execution fails with an exception, before the tear-down process.
+
+        :param error: The exception that failed the execution.
+        """
+        pass
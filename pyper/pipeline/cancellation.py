@@ -0,0 +1,80 @@
+import time
+from typing import Optional
+
+from pyper.exceptions import IllegalArgumentError
+
+__all__ = ['CancellationToken']
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation of a pipeline execution. A token may be cancelled from any thread (e.g.: a supervisor
+    thread), or expire once a deadline passes. Cancelling only assigns plain flags (no locks are involved), so it is
+    safe to cancel from a signal handler as well.
+
+    Once cancelled, the pipeline stops pulling data from its source. When draining (the default), the cycle in
+    progress completes. Otherwise, the cycle in progress is interrupted before its next command and its sink is not
+    called. Either way, cleanup callbacks are issued and the results gathered so far are returned.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Class initializer.
+
+        :param timeout: Optional number of seconds after which the token is considered cancelled (with draining).
+        """
+
+        # Whether the token was explicitly cancelled.
+        self._cancelled: bool = False
+
+        # Whether the cycle in progress should complete upon cancellation.
+        self._drain: bool = True
+
+        # Monotonic time after which the token is cancelled, if any.
+        self._deadline: Optional[float] = None
+        if timeout is not None:
+            self.cancel_after(timeout)
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        :return: True if the token was cancelled or its deadline has passed.
+        """
+        return self._cancelled or (self._deadline is not None and time.monotonic() >= self._deadline)
+
+    @property
+    def interrupted(self) -> bool:
+        """
+        :return: True if the token was cancelled without draining, so the cycle in progress should be interrupted.
+        """
+        return self._cancelled and not self._drain
+
+    @property
+    def drain(self) -> bool:
+        """
+        :return: True if the cycle in progress should complete upon cancellation.
+        """
+        return self._drain
+
+    def cancel(self, drain: bool = True):
+        """
+        Cancel the token. Once cancelled without draining, a token is never turned back to draining.
+
+        :param drain: True to let the cycle in progress complete, False to interrupt it.
+        """
+        self._drain = self._drain and drain
+        self._cancelled = True
+
+    def cancel_after(self, timeout: float):
+        """
+        Set a deadline, after which the token is considered cancelled (with draining). An earlier deadline, if already
+        set, is kept.
+
+        :param timeout: Number of seconds from now.
+        :raises IllegalArgumentError: If the timeout is negative.
+        """
+        if timeout < 0:
+            raise IllegalArgumentError(f"Invalid timeout: {timeout}. Expected a non-negative number.")
+
+        deadline: float = time.monotonic() + timeout
+        self._deadline = deadline if self._deadline is None else min(self._deadline, deadline)
@@ -0,0 +1,390 @@
+import csv
+import math
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from pyper.exceptions import IllegalArgumentError, IllegalStateError
+from .command import Command, fusable
+from .context import Context, PipelineContextProvider
+from .sink import Sink
+from .source import Source
+from .utils import to_set
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = ['ColumnarContext', 'ColumnarContextProvider', 'CsvBlockSource', 'ParquetBlockSource', 'ColumnCommand',
+           'FilterRowsCommand', 'ColumnarSink']
+
+
+class ColumnarContext(Context):
+    """
+    A context holding a block of rows as columns, so commands operate on whole columns rather than on a single row.
+    Each column is an attribute of the context, hence requirements of commands (and properties provided by sources)
+    are validated against column names.
+
+    Columns are NumPy arrays when NumPy is installed (allowing vectorized computation), otherwise plain lists.
+    """
+
+    def __init__(self):
+        """
+        Class initializer.
+        """
+        super().__init__()
+
+        # Number of rows in current block.
+        self._num_rows: int = 0
+
+        # Names of columns of current block, in the order they were set.
+        self._column_names: List[str] = []
+
+    @property
+    def num_rows(self) -> int:
+        """
+        :return: Number of rows in current block.
+        """
+        return self._num_rows
+
+    @property
+    def column_names(self) -> List[str]:
+        """
+        :return: Names of columns of current block.
+        """
+        return list(self._column_names)
+
+    def reset(self, num_rows: int):
+        """
+        Start a new block: remove all columns of the previous block. Called by sources before setting new columns.
+
+        :param num_rows: Number of rows in the new block.
+        """
+        for name in self._column_names:
+            self._attributes.pop(name, None)
+            self._lazy_attributes.pop(name, None)
+
+        self._column_names = []
+        self._num_rows = num_rows
+
+    def set_column(self, name: str, values: Sequence, dtype: Optional[object] = None):
+        """
+        Set a column of current block.
+
+        :param name: Column name.
+        :param values: Column values, one per row.
+        :param dtype: Optional NumPy data type of the column. Ignored if NumPy is not installed.
+        :raises IllegalArgumentError: If the number of values does not match the number of rows in the block.
+        """
+        column = numpy.asarray(values, dtype=dtype) if numpy is not None else list(values)
+        if len(column) != self._num_rows:
+            raise IllegalArgumentError(f"Column '{name}' has {len(column)} values, while block has {self._num_rows} "
+                                       f"rows.")
+
+        self.set(name, column)
+        if name not in self._column_names:
+            self._column_names.append(name)
+
+    def filter(self, mask: Sequence[bool]):
+        """
+        Keep only the rows of current block whose mask value is true.
+
+        :param mask: A boolean value per row.
+        :raises IllegalArgumentError: If the mask does not match the number of rows in the block.
+        """
+        if len(mask) != self._num_rows:
+            raise IllegalArgumentError(f"Mask has {len(mask)} values, while block has {self._num_rows} rows.")
+
+        if numpy is not None:
+            mask = numpy.asarray(mask, dtype=bool)
+            for name in self._column_names:
+                self.set(name, self.get(name)[mask])
+            self._num_rows = int(mask.sum())
+        else:
+            for name in self._column_names:
+                self.set(name, [value for value, keep in zip(self.get(name), mask) if keep])
+            self._num_rows = sum(1 for keep in mask if keep)
+
+    def rows(self) -> Iterator[Dict[str, object]]:
+        """
+        :return: Iterator over rows of current block, each one as a dictionary of column name to value.
+        """
+        columns: List[Tuple[str, Sequence]] = [(name, self.get(name)) for name in self._column_names]
+        for index in range(self._num_rows):
+            yield {name: column[index] for name, column in columns}
+
+
+class ColumnarContextProvider(PipelineContextProvider[ColumnarContext]):
+    """
+    Creates columnar contexts. Should be passed to pipelines whose source is a block source.
+    """
+
+    def create_context(self) -> ColumnarContext:
+        return ColumnarContext()
+
+
+def _columnar(context: Context) -> ColumnarContext:
+    """
+    :return: The context, if it is a columnar one.
+    :raises IllegalStateError: If the context is not a columnar context.
+    """
+    if not isinstance(context, ColumnarContext):
+        raise IllegalStateError(f"Invalid context type: {type(context)}. Expected a ColumnarContext (see "
+                                f"'ColumnarContextProvider').")
+    return context
+
+
+class CsvBlockSource(Source[ColumnarContext]):
+    """
+    Reads a CSV file (with a header row) in blocks of rows, setting each column of a block into the context.
+    """
+
+    def __init__(self,
+                 path: str,
+                 columns: Optional[Union[Set, List, Tuple, str]] = None,
+                 block_size: int = 65536,
+                 types: Optional[Dict[str, Callable[[str], object]]] = None,
+                 delimiter: str = ","):
+        """
+        Class initializer.
+
+        :param path: Path of CSV file.
+        :param columns: Names of columns to read. Defaults to all columns (the header is read upon construction).
+        :param block_size: Maximal number of rows per block.
+        :param types: Optional conversion of values per column (e.g.: {"price": float}). Values of other columns are
+        kept as strings.
+        :param delimiter: Field delimiter.
+        """
+        if block_size < 1:
+            raise IllegalArgumentError(f"Invalid block size: {block_size}. Expected a positive number.")
+
+        self._path: str = path
+        self._delimiter: str = delimiter
+        if columns is None:
+            with open(path, newline="") as f:
+                columns = next(csv.reader(f, delimiter=delimiter), [])
+
+        # Requested columns, in a deterministic order.
+        self._columns: List[str] = list(columns) if isinstance(columns, (list, tuple)) else sorted(to_set(columns))
+        super().__init__(provides=self._columns)
+
+        self._block_size: int = block_size
+        self._types: Dict[str, Callable[[str], object]] = dict(types) if types else {}
+
+        self._file = None
+        self._reader = None
+
+        # Position of each requested column within a row.
+        self._indices: List[int] = []
+
+    def setup(self):
+        self._file = open(self._path, newline="")
+        self._reader = csv.reader(self._file, delimiter=self._delimiter)
+
+        header: List[str] = next(self._reader, [])
+        missing: Set[str] = set(self._columns) - set(header)
+        if len(missing) > 0:
+            raise IllegalStateError(f"Column(s) missing in '{self._path}': '{','.join(sorted(missing))}'.")
+
+        self._indices = [header.index(name) for name in self._columns]
+
+    def cleanup(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._reader = None
+
+    def next(self, context: ColumnarContext) -> bool:
+        context = _columnar(context)
+
+        rows: List[List[str]] = []
+        for row in self._reader:
+            rows.append(row)
+            if len(rows) >= self._block_size:
+                break
+
+        if not rows:
+            return False
+
+        context.reset(len(rows))
+        for name, index in zip(self._columns, self._indices):
+            convert: Optional[Callable[[str], object]] = self._types.get(name)
+            values: List = [row[index] for row in rows]
+            context.set_column(name, [convert(value) for value in values] if convert else values)
+
+        return True
+
+
+def _import_parquet():
+    """
+    :return: The 'pyarrow.parquet' module.
+    :raises IllegalStateError: If PyArrow is not installed.
+    """
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        raise IllegalStateError("Reading Parquet files requires PyArrow. Install it via 'pip install pyper[parquet]'.")
+
+    return pyarrow.parquet
+
+
+class ParquetBlockSource(Source[ColumnarContext]):
+    """
+    Reads a Parquet file in blocks of rows (requires PyArrow), setting each column of a block into the context.
+    """
+
+    def __init__(self,
+                 path: str,
+                 columns: Optional[Union[List, Tuple, str]] = None,
+                 block_size: int = 65536):
+        """
+        Class initializer.
+
+        :param path: Path of Parquet file.
+        :param columns: Names of columns to read. Defaults to all columns (the schema is read upon construction).
+        :param block_size: Maximal number of rows per block.
+        :raises IllegalStateError: If PyArrow is not installed.
+        """
+        if block_size < 1:
+            raise IllegalArgumentError(f"Invalid block size: {block_size}. Expected a positive number.")
+
+        parquet = _import_parquet()
+        metadata = parquet.ParquetFile(path).metadata
+
+        self._path: str = path
+        self._columns: List[str] = [columns] if isinstance(columns, str) else \
+            list(columns) if columns is not None else list(metadata.schema.to_arrow_schema().names)
+        super().__init__(provides=self._columns)
+
+        self._block_size: int = block_size
+        self._num_rows: int = metadata.num_rows
+        self._batches = None
+
+    @property
+    def estimated_size(self) -> Optional[int]:
+        return math.ceil(self._num_rows / self._block_size)
+
+    def setup(self):
+        parquet = _import_parquet()
+        self._batches = parquet.ParquetFile(self._path).iter_batches(batch_size=self._block_size,
+                                                                     columns=self._columns)
+
+    def cleanup(self):
+        self._batches = None
+
+    def next(self, context: ColumnarContext) -> bool:
+        context = _columnar(context)
+
+        batch = next(self._batches, None)
+        if batch is None:
+            return False
+
+        context.reset(batch.num_rows)
+        for name, array in zip(batch.schema.names, batch.columns):
+            context.set_column(name, array.to_numpy(zero_copy_only=False) if numpy is not None else array.to_pylist())
+
+        return True
+
+
+@fusable
+class ColumnCommand(Command[ColumnarContext]):
+    """
+    Computes a column from other columns of the block, in a single call over whole columns::
+
+        ColumnCommand(["price", "quantity"], "total", lambda price, quantity: price * quantity)
+    """
+
+    def __init__(self,
+                 inputs: Union[List, Tuple, str],
+                 output: str,
+                 function: Callable[..., Sequence],
+                 dtype: Optional[object] = None):
+        """
+        Class initializer.
+
+        :param inputs: Name(s) of input columns, passed to the function in this order.
+        :param output: Name of the computed column.
+        :param function: Function computing the output column from the input columns.
+        :param dtype: Optional NumPy data type of the output column.
+        """
+        self._inputs: List[str] = [inputs] if isinstance(inputs, str) else list(inputs)
+        super().__init__(requires_properties=self._inputs, provides_properties=output)
+
+        self._output: str = output
+        self._function: Callable[..., Sequence] = function
+        self._dtype: Optional[object] = dtype
+
+    def handle(self, context: ColumnarContext) -> bool:
+        columns: List[Sequence] = [context.get(name) for name in self._inputs]
+        context.set_column(self._output, self._function(*columns), self._dtype)
+        return True
+
+
+@fusable
+class FilterRowsCommand(Command[ColumnarContext]):
+    """
+    Keeps only the rows of the block matching a predicate over whole columns::
+
+        FilterRowsCommand("price", lambda price: price > 100)
+
+    A block left without rows skips the rest of the cycle.
+    """
+
+    def __init__(self, inputs: Union[List, Tuple, str], predicate: Callable[..., Sequence[bool]]):
+        """
+        Class initializer.
+
+        :param inputs: Name(s) of columns passed to the predicate, in this order.
+        :param predicate: Function computing a boolean mask (a value per row) from the input columns.
+        """
+        self._inputs: List[str] = [inputs] if isinstance(inputs, str) else list(inputs)
+        super().__init__(requires_properties=self._inputs)
+
+        self._predicate: Callable[..., Sequence[bool]] = predicate
+
+    def handle(self, context: ColumnarContext) -> bool:
+        context.filter(self._predicate(*[context.get(name) for name in self._inputs]))
+        return context.num_rows > 0
+
+
+class ColumnarSink(Sink[ColumnarContext]):
+    """
+    Collects columns of all blocks. The result is a dictionary of column name to all its values (concatenated
+    across blocks). Empty blocks are ignored.
+    """
+
+    def __init__(self, columns: Union[List, Tuple, str]):
+        """
+        Class initializer.
+
+        :param columns: Name(s) of columns to collect.
+        """
+        super().__init__()
+        self._columns: List[str] = [columns] if isinstance(columns, str) else list(columns)
+        self._requires = set(self._columns)
+
+        # Blocks collected so far, per column.
+        self._blocks: Dict[str, List[Sequence]] = {}
+
+    def setup(self):
+        self._blocks = {name: [] for name in self._columns}
+
+    def handle(self, context: ColumnarContext):
+        # A block whose rows were all filtered out may lack columns computed later in the pipeline.
+        if context.num_rows == 0:
+            return
+
+        for name in self._columns:
+            self._blocks[name].append(context.get(name))
+
+    def get_result(self) -> Dict[str, Sequence]:
+        if numpy is not None:
+            return {name: numpy.concatenate(blocks) if blocks else numpy.empty(0)
+                    for name, blocks in self._blocks.items()}
+
+        return {name: [value for block in blocks for value in block] for name, blocks in self._blocks.items()}
+
+    def get_cycle_result(self) -> Dict[str, Sequence]:
+        """
+        :return: Columns of the last block.
+        """
+        return {name: blocks[-1] if blocks else [] for name, blocks in self._blocks.items()}
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Set, Generic, Optional, Union, List, Tuple
+from typing import Set, Generic, Optional, Union, List, Tuple, Type, TypeVar
+
+from pyper.exceptions import IllegalStateError
 
 from pyper.pipeline.callbacks import LifecycleAware
 from pyper.pipeline.context import CTX, Context
@@ -25,8 +27,15 @@ class Command(ABC, LifecycleAware, Generic[CTX]):
     Each command declares a set of properties it sets ('provides'), and a set of properties consumes ('requires).
     The pipeline asserts that before each call a command has all required properties set, and after each call, all
     provided properties are defined (not None).
+
+    A command may be marked as 'fusable' (see the 'fusable' decorator) to indicate it is a lightweight, side-effect-free
+    step. The pipeline fuses runs of adjacent fusable commands into a single 'FusedCommand', so per-cycle validation
+    is performed only at the boundaries of the fused group.
     """
 
+    # Indicates if this command may be fused with adjacent fusable commands.
+    fusable: bool = False
+
     def __init__(self,
                  provides_properties: Optional[Union[Set, List, Tuple, object]] = None,
                  requires_properties: Optional[Union[Set, List, Tuple, object]] = None):
@@ -106,3 +115,69 @@ class Command(ABC, LifecycleAware, Generic[CTX]):
         if len(missing_requirements) > 0:
             raise MissingRequirementsException(
                 message.format(cmd_name=self.__class__.__name__, requirements=missing_requirements))
+
+
+CMD = TypeVar("CMD", bound=Type[Command])
+
+
+def fusable(cls: CMD) -> CMD:
+    """
+    Class decorator marking a command class as fusable: a lightweight, side-effect-free command that a pipeline
+    may fuse with adjacent fusable commands.
+
+    :param cls: Command class to mark.
+    :return: The same class.
+    """
+    cls.fusable = True
+    return cls
+
+
+class FusedCommand(Command[CTX]):
+    """
+    A composite command executing a run of adjacent fusable commands in a single call. The combined requirements are
+    calculated once, upon construction: the group requires whatever its members require and was not provided by an
+    earlier member, and provides whatever any of its members provides.
+
+    Members behave as if they were executed by the pipeline one by one, except that 'provides' validation occurs once,
+    after the last member executes.
+    """
+
+    fusable = True
+
+    def __init__(self, commands: List[Command[CTX]]):
+        """
+        Class initializer.
+
+        :param commands: Commands to fuse, in execution order.
+        """
+        provides: Set[str] = set()
+        requires: Set[str] = set()
+        for cmd in commands:
+            requires.update(cmd.requires - provides)
+            provides.update(cmd.provides)
+
+        super().__init__(provides, requires)
+
+        # Fused commands, in execution order.
+        self._commands: Tuple[Command[CTX], ...] = tuple(commands)
+
+    @property
+    def commands(self) -> Tuple[Command[CTX], ...]:
+        """
+        :return: Fused commands, in execution order.
+        """
+        return self._commands
+
+    def handle(self, context: CTX) -> bool:
+        for cmd in self._commands:
+            results = cmd.handle(context)
+
+            # Fast path: most commands simply return 'True'.
+            if results is not True:
+                if results is None or results is False:
+                    return False
+
+                raise IllegalStateError(f"Command {cmd.__class__.__name__} returned an unexpected results (type: "
+                                        f"{type(results)}). Expected either bool or None.")
+
+        return True
@@ -1,4 +1,6 @@
-from typing import TypeVar, Optional, Dict, Generic
+from typing import TypeVar, Optional, Dict, Generic, Callable, Union
+
+from pyper.exceptions import IllegalArgumentError
 
 PV = TypeVar("PV")
 
@@ -14,6 +16,8 @@ class Context:
 
     A context is composed of properties (set of pre-defined fields, defined within the '__init__') and attributes,
     which are free-style values maintained in a dictionary.
+
+    An attribute may also be lazy (see 'set_lazy'): its value is computed only the first time it is retrieved.
     """
 
     def __init__(self):
@@ -24,14 +28,20 @@ class Context:
         # Maintains context's attributes.
         self._attributes: Dict[str, object] = {}
 
+        # Maintains lazy attributes which were not computed yet (attribute name -> thunk or future).
+        self._lazy_attributes: Dict[str, object] = {}
+
     def get(self, attribute_name: str, fallback_value: Optional[PV] = None) -> Optional[PV]:
         """
-        Retrieve an attribute.
+        Retrieve an attribute. If the attribute is lazy, its value is computed (and memoized) on the first call.
 
         :param attribute_name: Attribute name.
         :param fallback_value:  Optional fallback value, in-case attribute was not set. Defaults to 'None'.
         :return: Attribute value, which may be 'None'.
         """
+        if self._lazy_attributes and attribute_name in self._lazy_attributes:
+            self._resolve(attribute_name)
+
         return self._attributes.setdefault(attribute_name, fallback_value)
 
     def set(self, attribute_name: str, attribute_value: any):
@@ -41,8 +51,35 @@ class Context:
         :param attribute_name: Attribute name.
         :param attribute_value:  Attribute value.
         """
+        self._lazy_attributes.pop(attribute_name, None)
         self._attributes[attribute_name] = attribute_value
 
+    def set_lazy(self, attribute_name: str, value_provider: Union[Callable[[], any], object]):
+        """
+        Sets a lazy attribute. A lazy attribute is considered as existing (e.g.: for requirements validation), but its
+        value is computed only on the first call to 'get'. The computed value is memoized, so later calls
+        return the same value.
+
+        :param attribute_name: Attribute name.
+        :param value_provider: Either a no-argument callable (thunk) or a future (an object with a 'result()' method,
+        such as 'concurrent.futures.Future') providing the attribute value.
+        """
+        if not callable(value_provider) and not callable(getattr(value_provider, "result", None)):
+            raise IllegalArgumentError(f"Invalid lazy value provider type: {type(value_provider)}. Expected a "
+                                       f"callable or a future.")
+
+        self._attributes.pop(attribute_name, None)
+        self._lazy_attributes[attribute_name] = value_provider
+
+    def is_lazy(self, attribute_name: str) -> bool:
+        """
+        Provide indication if a given attribute is lazy and its value was not computed yet.
+
+        :param attribute_name: Name of attribute.
+        :return: True if attribute is lazy and pending computation, False if not.
+        """
+        return attribute_name in self._lazy_attributes
+
     def has_attribute(self, attribute_name: str) -> bool:
         """
         Provide indication if a given attribute exists.
@@ -50,7 +87,20 @@ class Context:
         :param attribute_name: Name of attribute.
         :return: True if attribute exists, False if not.
         """
-        return attribute_name in self._attributes
+        return attribute_name in self._attributes or attribute_name in self._lazy_attributes
+
+    def _resolve(self, attribute_name: str):
+        """
+        Compute the value of a lazy attribute and store it as a regular attribute.
+
+        :param attribute_name: Name of lazy attribute.
+        """
+        value_provider = self._lazy_attributes[attribute_name]
+        value = value_provider() if callable(value_provider) else value_provider.result()
+
+        # Remove the lazy entry only after a successful computation, so a failing provider is retried on next call.
+        del self._lazy_attributes[attribute_name]
+        self._attributes[attribute_name] = value
 
     def is_property_defined(self, property_name: str) -> bool:
         """
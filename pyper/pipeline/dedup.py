@@ -0,0 +1,312 @@
+import hashlib
+import math
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Set, Tuple, Union
+
+from pyper.exceptions import IllegalArgumentError
+from .callbacks import LifecycleAware
+from .command import Command
+from .context import CTX
+from .utils import to_set
+
+__all__ = ['KeyIndex', 'LRUKeyIndex', 'BloomFilterIndex', 'SqliteKeyIndex', 'DeduplicateCommand',
+           'RecordKeyCommand']
+
+
+class KeyIndex(ABC, LifecycleAware):
+    """
+    An index of keys already seen by a 'DeduplicateCommand'. Keys are fixed-size digests (bytes).
+
+    A persistent index must not persist keys added since its last save when execution fails (see 'failed').
+    """
+
+    @abstractmethod
+    def contains(self, key: bytes) -> bool:
+        """
+        :param key: Key to look-up.
+        :return: True if the key was seen before.
+        """
+        pass
+
+    @abstractmethod
+    def add(self, key: bytes) -> bool:
+        """
+        Add a key to the index.
+
+        :param key: Key to add.
+        :return: True if the key was not seen before, False if it is a duplicate.
+        """
+        pass
+
+
+class LRUKeyIndex(KeyIndex):
+    """
+    An exact, in-memory index bounded to a maximal number of keys. When full, the least-recently seen key is evicted
+    (so a duplicate of an evicted key is no longer detected).
+    """
+
+    def __init__(self, max_size: int = 1_000_000):
+        """
+        Class initializer.
+
+        :param max_size: Maximal number of keys to maintain.
+        """
+        if max_size < 1:
+            raise IllegalArgumentError(f"Invalid index size: {max_size}. Expected a positive number.")
+
+        self._max_size: int = max_size
+        self._keys: OrderedDict = OrderedDict()
+
+    def setup(self):
+        self._keys.clear()
+
+    def contains(self, key: bytes) -> bool:
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return True
+
+        return False
+
+    def add(self, key: bytes) -> bool:
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return False
+
+        self._keys[key] = None
+        if len(self._keys) > self._max_size:
+            self._keys.popitem(last=False)
+
+        return True
+
+
+class BloomFilterIndex(KeyIndex):
+    """
+    A probabilistic index maintaining any number of keys in a fixed amount of memory. It never misses a duplicate
+    (of up to 'capacity' keys), but may falsely consider a new key as a duplicate, with a probability of up to
+    'error_rate'.
+
+    If a path is provided, the filter is loaded from it during setup (if exists) and saved to it during cleanup, so
+    duplicates are detected across pipeline executions.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001, path: Optional[str] = None):
+        """
+        Class initializer.
+
+        :param capacity: Expected number of keys.
+        :param error_rate: Acceptable probability of false positives, when holding 'capacity' keys.
+        :param path: Optional file to persist the filter at.
+        """
+        if capacity < 1:
+            raise IllegalArgumentError(f"Invalid capacity: {capacity}. Expected a positive number.")
+        if not 0 < error_rate < 1:
+            raise IllegalArgumentError(f"Invalid error rate: {error_rate}. Expected a value in range (0, 1).")
+
+        # Optimal number of bits and hash functions for the requested capacity and error rate.
+        self._size: int = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self._hash_count: int = max(1, round(self._size / capacity * math.log(2)))
+
+        self._path: Optional[str] = path
+        self._bits: bytearray = bytearray((self._size + 7) // 8)
+
+        # Indicates if current execution failed, in which case the filter is not saved.
+        self._failed: bool = False
+
+    @property
+    def size(self) -> int:
+        """
+        :return: Number of bits in the filter.
+        """
+        return self._size
+
+    @property
+    def hash_count(self) -> int:
+        """
+        :return: Number of hash functions.
+        """
+        return self._hash_count
+
+    def setup(self):
+        self._bits = bytearray((self._size + 7) // 8)
+        self._failed = False
+        if self._path and os.path.exists(self._path):
+            with open(self._path, "rb") as f:
+                data: bytes = f.read()
+
+            if len(data) != len(self._bits):
+                raise IllegalArgumentError(f"Bloom filter file '{self._path}' does not match filter size.")
+            self._bits[:] = data
+
+    def cleanup(self):
+        if self._path and not self._failed:
+            with open(self._path, "wb") as f:
+                f.write(self._bits)
+
+    def failed(self, error: BaseException):
+        # Keep the filter file as it was when execution started.
+        self._failed = True
+
+    def contains(self, key: bytes) -> bool:
+        bits: bytearray = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def add(self, key: bytes) -> bool:
+        bits: bytearray = self._bits
+        is_new: bool = False
+        for position in self._positions(key):
+            mask: int = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                is_new = True
+
+        return is_new
+
+    def _positions(self, key: bytes):
+        """
+        :return: Bit positions of a key. Double hashing is used to derive all positions from two 64-bit hashes.
+        """
+        digest: bytes = hashlib.blake2b(key, digest_size=16).digest()
+        h1: int = int.from_bytes(digest[:8], "little")
+        h2: int = int.from_bytes(digest[8:], "little") | 1
+
+        return ((h1 + i * h2) % self._size for i in range(self._hash_count))
+
+
+class SqliteKeyIndex(KeyIndex):
+    """
+    An exact, persistent index maintained in a sqlite database, so duplicates are detected across pipeline
+    executions. Keys are committed in batches and on cleanup. If execution fails, keys added since the last commit
+    are rolled back.
+    """
+
+    def __init__(self, path: str, commit_every: int = 1000):
+        """
+        Class initializer.
+
+        :param path: Path of database file.
+        :param commit_every: Number of new keys between two commits.
+        """
+        self._path: str = path
+        self._commit_every: int = commit_every
+        self._pending: int = 0
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def setup(self):
+        self._connection = sqlite3.connect(self._path)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS keys (key BLOB PRIMARY KEY) WITHOUT ROWID")
+        self._pending = 0
+
+    def failed(self, error: BaseException):
+        if self._connection:
+            self._connection.rollback()
+            self._pending = 0
+
+    def cleanup(self):
+        if self._connection:
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+
+    def contains(self, key: bytes) -> bool:
+        return self._connection.execute("SELECT 1 FROM keys WHERE key = ?", (key,)).fetchone() is not None
+
+    def add(self, key: bytes) -> bool:
+        is_new: bool = self._connection.execute("INSERT OR IGNORE INTO keys VALUES (?)", (key,)).rowcount == 1
+        if is_new:
+            self._pending += 1
+            if self._pending >= self._commit_every:
+                self._connection.commit()
+                self._pending = 0
+
+        return is_new
+
+
+class DeduplicateCommand(Command[CTX]):
+    """
+    A command skipping cycles whose key was already seen. The key is composed of the values of configured context
+    attributes. Place it early in the pipeline, so duplicates are dropped before any expensive command executes.
+
+    This command only checks whether a key was seen. A key is recorded as seen by a companion 'RecordKeyCommand'
+    (see 'recorder'), which should be placed last, so only cycles that completed successfully are recorded. A cycle
+    that fails (or is skipped) is thus processed again when its data is replayed::
+
+        dedup = DeduplicateCommand(["user_id", "event_id"], SqliteKeyIndex("/var/data/seen.db"))
+        pipeline.add_command(dedup)
+        ...
+        pipeline.add_command(dedup.recorder())
+
+    Key values are digested via their 'repr', so they should have a stable representation (e.g.: strings and numbers)
+    when a persistent index is used.
+    """
+
+    def __init__(self, key_properties: Union[Set, List, Tuple, str], index: Optional[KeyIndex] = None):
+        """
+        Class initializer.
+
+        :param key_properties: Name(s) of context attributes composing the key.
+        :param index: Index of seen keys. Defaults to an 'LRUKeyIndex'.
+        """
+        super().__init__(requires_properties=key_properties)
+
+        # Properties composing the key, in a deterministic order.
+        self._key_properties: List[str] = sorted(to_set(key_properties))
+        if len(self._key_properties) == 0:
+            raise IllegalArgumentError("At least one key property is required.")
+
+        self._index: KeyIndex = index if index is not None else LRUKeyIndex()
+
+    @property
+    def index(self) -> KeyIndex:
+        """
+        :return: Index of seen keys.
+        """
+        return self._index
+
+    def recorder(self) -> 'RecordKeyCommand[CTX]':
+        """
+        :return: A new command recording keys of completed cycles into this command's index.
+        """
+        return RecordKeyCommand(self)
+
+    def key(self, context: CTX) -> bytes:
+        """
+        :param context: Context to extract key values from.
+        :return: Key of current cycle.
+        """
+        values: Tuple = tuple(context.get(name) for name in self._key_properties)
+        return hashlib.blake2b(repr(values).encode("utf-8"), digest_size=16).digest()
+
+    def setup(self):
+        self._index.setup()
+
+    def failed(self, error: BaseException):
+        self._index.failed(error)
+
+    def cleanup(self):
+        self._index.cleanup()
+
+    def handle(self, context: CTX) -> bool:
+        return not self._index.contains(self.key(context))
+
+
+class RecordKeyCommand(Command[CTX]):
+    """
+    Records the key of the current cycle into the index of a 'DeduplicateCommand'. Should be placed last in the
+    pipeline (see 'DeduplicateCommand.recorder'). The index's lifecycle is managed by the deduplication command.
+    """
+
+    def __init__(self, deduplicate: DeduplicateCommand[CTX]):
+        """
+        Class initializer.
+
+        :param deduplicate: Deduplication command whose keys are recorded.
+        """
+        super().__init__(requires_properties=deduplicate.requires)
+        self._deduplicate: DeduplicateCommand[CTX] = deduplicate
+
+    def handle(self, context: CTX) -> bool:
+        self._deduplicate.index.add(self._deduplicate.key(context))
+        return True
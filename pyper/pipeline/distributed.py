@@ -0,0 +1,693 @@
+import multiprocessing
+import os
+import pickle
+import socket
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from pyper.exceptions import IllegalArgumentError, IllegalStateError
+from .callbacks import LifecycleAware
+from .context import CTX, PipelineContextProvider
+from .exceptions import AbortPipeline
+from .pipeline import Pipeline, PipelineSession
+from .source import Source
+from .tuning import AdaptiveController
+
+__all__ = ['QueueBackend', 'SqliteQueueBackend', 'DistributedRunner', 'ItemFailure', 'run_worker']
+
+# Name of flag set by the coordinator once all items were published.
+CLOSED_FLAG = "closed"
+
+# Name of flag set by a worker whose pipeline was aborted (see 'AbortPipeline'). Its value is the worker identifier.
+ABORTED_FLAG = "aborted"
+
+# Name of flag holding the last error raised within a worker (prefixed by the worker identifier).
+ERROR_FLAG = "error"
+
+# Names of flags through which the coordinator adjusts the number of workers and their batch size during execution.
+WORKERS_FLAG = "workers"
+BATCH_SIZE_FLAG = "batch_size"
+
+# Maximal number of items the coordinator publishes at once.
+_PUBLISH_BATCH_SIZE = 100
+
+
+class QueueBackend(ABC, LifecycleAware):
+    """
+    A work queue shared by a coordinator and its workers. Items are leased by workers for a limited time and
+    removed only when acknowledged, along with their result. An item whose lease expires (e.g.: since its worker died)
+    is delivered again -- hence, delivery is at-least-once.
+
+    A backend object is passed to worker processes, so it must be picklable. 'setup' is called by the coordinator
+    only, to initialize the queue for a new execution.
+    """
+
+    @abstractmethod
+    def put(self, payload: bytes) -> int:
+        """
+        Publish a new item.
+
+        :param payload: Serialized item.
+        :return: Item identifier. Identifiers increase in publishing order and are never reused.
+        """
+        pass
+
+    def put_many(self, payloads: List[bytes]) -> List[int]:
+        """
+        Publish several items at once. Backends should override this method to publish all items in a single round
+        trip (or transaction).
+
+        :param payloads: Serialized items.
+        :return: Item identifiers, in the same order as 'payloads'.
+        """
+        return [self.put(payload) for payload in payloads]
+
+    @abstractmethod
+    def lease(self, worker_id: str, count: int, lease_timeout: float) -> List[Tuple[int, bytes, int]]:
+        """
+        Lease available items: items never leased or whose lease has expired.
+
+        :param worker_id: Identifier of leasing worker.
+        :param count: Maximal number of items to lease.
+        :param lease_timeout: Number of seconds after which the items are delivered again, unless acknowledged.
+        :return: List of leased items (identifier, payload and number of times the item was leased, including this
+        lease). Empty if none available.
+        """
+        pass
+
+    @abstractmethod
+    def release(self, item_id: int):
+        """
+        Release the lease of an item that was not processed, so it is delivered again without waiting for its lease
+        to expire.
+
+        :param item_id: Item identifier.
+        """
+        pass
+
+    @abstractmethod
+    def ack(self, item_id: int, result: bytes):
+        """
+        Acknowledge an item was processed, and store its result.
+
+        :param item_id: Item identifier.
+        :param result: Serialized result.
+        """
+        pass
+
+    @abstractmethod
+    def collect(self) -> List[Tuple[int, bytes]]:
+        """
+        Retrieve (and remove) all results stored since last call.
+
+        :return: List of item identifiers and their serialized results.
+        """
+        pass
+
+    @abstractmethod
+    def pending_count(self) -> int:
+        """
+        :return: Number of items not acknowledged yet.
+        """
+        pass
+
+    @abstractmethod
+    def set_flag(self, name: str, value: Optional[str]):
+        """
+        Set a named flag, shared by coordinator and workers.
+
+        :param name: Flag name.
+        :param value: Flag value, or None to remove flag.
+        """
+        pass
+
+    @abstractmethod
+    def get_flag(self, name: str) -> Optional[str]:
+        """
+        :param name: Flag name.
+        :return: Flag value, or None if not set.
+        """
+        pass
+
+
+class SqliteQueueBackend(QueueBackend):
+    """
+    A queue backend maintained in a local sqlite database file. Suitable for worker processes on the same host,
+    without any external service.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        """
+        Class initializer.
+
+        :param path: Path of database file.
+        :param timeout: Number of seconds to wait for a database lock.
+        """
+        self._path: str = path
+        self._timeout: float = timeout
+
+        # Connection to database and the process it was opened by (connections are not shared among processes).
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def __getstate__(self) -> Dict:
+        state: Dict = dict(self.__dict__)
+        state['_connection'] = None
+        state['_pid'] = None
+        return state
+
+    def _db(self) -> sqlite3.Connection:
+        """
+        :return: Connection to database, opened on first use within current process.
+        """
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self._path, timeout=self._timeout, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._pid = os.getpid()
+
+        return self._connection
+
+    def setup(self):
+        db: sqlite3.Connection = self._db()
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY AUTOINCREMENT, payload BLOB, lease_expiry REAL,
+                                              owner TEXT, attempts INTEGER DEFAULT 0);
+            CREATE TABLE IF NOT EXISTS results (id INTEGER PRIMARY KEY, payload BLOB);
+            CREATE TABLE IF NOT EXISTS flags (name TEXT PRIMARY KEY, value TEXT);
+            DELETE FROM items;
+            DELETE FROM results;
+            DELETE FROM flags;
+        """)
+
+    def cleanup(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def put(self, payload: bytes) -> int:
+        return self._db().execute("INSERT INTO items (payload) VALUES (?)", (payload,)).lastrowid
+
+    def put_many(self, payloads: List[bytes]) -> List[int]:
+        db: sqlite3.Connection = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            ids: List[int] = [db.execute("INSERT INTO items (payload) VALUES (?)", (payload,)).lastrowid
+                              for payload in payloads]
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+        return ids
+
+    def lease(self, worker_id: str, count: int, lease_timeout: float) -> List[Tuple[int, bytes, int]]:
+        db: sqlite3.Connection = self._db()
+        now: float = time.time()
+
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            items: List[Tuple[int, bytes, int]] = db.execute(
+                "SELECT id, payload, attempts + 1 FROM items WHERE lease_expiry IS NULL OR lease_expiry < ? "
+                "ORDER BY id LIMIT ?", (now, count)).fetchall()
+            db.executemany("UPDATE items SET lease_expiry = ?, owner = ?, attempts = attempts + 1 WHERE id = ?",
+                           [(now + lease_timeout, worker_id, item_id) for item_id, _, _ in items])
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+        return items
+
+    def release(self, item_id: int):
+        self._db().execute("UPDATE items SET lease_expiry = NULL, owner = NULL WHERE id = ?", (item_id,))
+
+    def ack(self, item_id: int, result: bytes):
+        db: sqlite3.Connection = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("INSERT OR REPLACE INTO results (id, payload) VALUES (?, ?)", (item_id, result))
+            db.execute("DELETE FROM items WHERE id = ?", (item_id,))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def collect(self) -> List[Tuple[int, bytes]]:
+        db: sqlite3.Connection = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            results: List[Tuple[int, bytes]] = db.execute("SELECT id, payload FROM results").fetchall()
+            db.execute("DELETE FROM results")
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+        return results
+
+    def pending_count(self) -> int:
+        return self._db().execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def set_flag(self, name: str, value: Optional[str]):
+        if value is None:
+            self._db().execute("DELETE FROM flags WHERE name = ?", (name,))
+        else:
+            self._db().execute("INSERT OR REPLACE INTO flags (name, value) VALUES (?, ?)", (name, value))
+
+    def get_flag(self, name: str) -> Optional[str]:
+        row = self._db().execute("SELECT value FROM flags WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+
+class ItemFailure(NamedTuple):
+    """
+    An item that failed in all its processing attempts, hence was given up on (see 'DistributedRunner.failures').
+    """
+
+    # Position of item in source order.
+    index: int
+
+    # The last error raised while processing the item.
+    error: str
+
+
+class _FailureMarker(NamedTuple):
+    """
+    Stored by a worker as the result of an item it gave up on.
+    """
+
+    error: str
+
+
+def run_worker(pipeline_factory: Callable[[], Pipeline],
+               backend: QueueBackend,
+               worker_id: Optional[str] = None,
+               batch_size: int = 1,
+               lease_timeout: float = 60.0,
+               poll_interval: float = 0.1,
+               slot: Optional[int] = None,
+               max_attempts: int = 3):
+    """
+    Execute a worker: lease items from the backend and process each one in a pipeline cycle, until the coordinator
+    closes the queue and all items are acknowledged. May be called on any process (or host) that has access to the
+    backend.
+
+    The coordinator may override the batch size during execution (see 'BATCH_SIZE_FLAG'), and retire workers by
+    lowering the number of workers (see 'WORKERS_FLAG'): a worker whose slot is not lower than that number exits.
+
+    An item whose processing raises an exception is released, so it is delivered again, and given up on after
+    'max_attempts' attempts: it is acknowledged with a failure marker instead of a result. Either way, the worker keeps
+    processing other items. The last error is recorded in 'ERROR_FLAG'.
+
+    If a command aborts the pipeline, the worker sets 'ABORTED_FLAG' and exits. All other workers exit as well once
+    they observe this flag.
+
+    :param pipeline_factory: A callable building the pipeline to process items with. The pipeline's source is not
+    used: each item's attributes are set directly into the context.
+    :param backend: Queue backend.
+    :param worker_id: Identifier of this worker. Defaults to host name and process id.
+    :param batch_size: Number of items to lease at once.
+    :param lease_timeout: Number of seconds after which leased items not acknowledged are delivered again.
+    :param poll_interval: Number of seconds to wait when no items are available.
+    :param slot: Optional index of this worker among the coordinator's workers.
+    :param max_attempts: Number of attempts to process an item before giving up on it.
+    """
+    worker_id = worker_id if worker_id else f"{socket.gethostname()}-{os.getpid()}"
+
+    try:
+        pipeline: Pipeline = pipeline_factory()
+        with pipeline.session() as session:
+            while session.active and not backend.get_flag(ABORTED_FLAG):
+                if slot is not None:
+                    workers: Optional[str] = backend.get_flag(WORKERS_FLAG)
+                    if workers is not None and slot >= int(workers):
+                        break
+
+                lease_size: int = int(backend.get_flag(BATCH_SIZE_FLAG) or batch_size)
+                items: List[Tuple[int, bytes, int]] = backend.lease(worker_id, lease_size, lease_timeout)
+                if not items:
+                    if backend.get_flag(CLOSED_FLAG) and backend.pending_count() == 0:
+                        break
+
+                    time.sleep(poll_interval)
+                    continue
+
+                for item_id, payload, attempts in items:
+                    _process_item(session, backend, worker_id, item_id, payload, attempts >= max_attempts)
+
+                    # A command aborted the pipeline. Items left leased are not processed.
+                    if not session.active:
+                        backend.set_flag(ABORTED_FLAG, worker_id)
+                        break
+
+    except BaseException as ex:
+        backend.set_flag(ERROR_FLAG, f"{worker_id}: {type(ex).__name__}: {ex}")
+        raise
+
+
+def _process_item(session: PipelineSession, backend: QueueBackend, worker_id: str, item_id: int, payload: bytes,
+                  last_attempt: bool):
+    """
+    Process a single item within a worker session and acknowledge it. If processing fails, the item is released (or
+    acknowledged with a failure marker, on its last attempt).
+    """
+    attributes: Dict[str, object] = pickle.loads(payload)
+
+    context = session.new_context()
+    for name, value in attributes.items():
+        context.set(name, value)
+
+    try:
+        result = session.process_context(context)
+    except Exception as ex:
+        error: str = f"{type(ex).__name__}: {ex}"
+        backend.set_flag(ERROR_FLAG, f"{worker_id}: {error}")
+        if last_attempt:
+            backend.ack(item_id, pickle.dumps(_FailureMarker(error)))
+        else:
+            backend.release(item_id)
+        return
+
+    if session.active:
+        backend.ack(item_id, pickle.dumps(result))
+
+
+class DistributedRunner:
+    """
+    Executes a pipeline over several worker processes. The coordinator (the process calling 'run') pulls items from
+    the source and publishes the attributes the source provides (see 'Source.provides') to a queue backend. Each
+    worker builds the same pipeline via a factory and processes the items it leases. The sink result of each item is
+    sent back to the coordinator, which merges all results.
+
+    Delivery is at-least-once: an item leased by a worker that dies is delivered again once its lease expires,
+    and dead workers are restarted while work remains. Results are collected per item, so an item processed twice
+    contributes a single result. An item whose processing keeps raising an exception is given up on after
+    'max_attempts' attempts: it is excluded from the results and reported by 'failures'.
+
+    Items are published in batches. If 'max_pending' is set, publishing pauses while the number of items not
+    acknowledged yet reaches it, so a fast source does not flood the backend.
+
+    If a command aborts the pipeline in any worker, all workers stop and 'run' returns None (as 'Pipeline.run' does).
+
+    If an 'AdaptiveController' is provided, the number of workers and batch size are adjusted during execution
+    according to live throughput (within the controller's bounds).
+    """
+
+    def __init__(self,
+                 pipeline_factory: Callable[[], Pipeline],
+                 source: Source,
+                 backend: QueueBackend,
+                 workers: int = 2,
+                 batch_size: int = 1,
+                 lease_timeout: float = 60.0,
+                 poll_interval: float = 0.1,
+                 max_restarts: Optional[int] = None,
+                 merge: Optional[Callable[[List[object]], object]] = None,
+                 context_provider: PipelineContextProvider = PipelineContextProvider(),
+                 start_method: Optional[str] = None,
+                 tuner: Optional[AdaptiveController] = None,
+                 max_attempts: int = 3,
+                 max_pending: Optional[int] = None):
+        """
+        Class initializer.
+
+        :param pipeline_factory: A picklable callable (e.g.: a module-level function) building the pipeline each
+        worker executes.
+        :param source: Source of items, read by the coordinator.
+        :param backend: Queue backend shared by coordinator and workers.
+        :param workers: Number of worker processes.
+        :param batch_size: Number of items a worker leases at once.
+        :param lease_timeout: Number of seconds after which leased items not acknowledged are delivered again.
+        :param poll_interval: Number of seconds to wait when there is nothing to do.
+        :param max_restarts: Maximal number of worker restarts. Defaults to 3 times the number of workers.
+        :param merge: Callable merging the per-item results (given in source order). By default, the list of
+        results is returned as-is.
+        :param context_provider: Factory of the context the source sets items into.
+        :param start_method: Multiprocessing start method ('fork', 'spawn', ...). Defaults to platform's default.
+        :param tuner: Optional controller adjusting number of workers and batch size during execution. 'workers' and
+        'batch_size' serve as initial settings.
+        :param max_attempts: Number of attempts to process an item before giving up on it.
+        :param max_pending: Optional maximal number of items published but not acknowledged yet (high-water mark).
+        """
+        if workers < 1:
+            raise IllegalArgumentError(f"Invalid number of workers: {workers}. Expected a positive number.")
+        if batch_size < 1:
+            raise IllegalArgumentError(f"Invalid batch size: {batch_size}. Expected a positive number.")
+        if max_attempts < 1:
+            raise IllegalArgumentError(f"Invalid number of attempts: {max_attempts}. Expected a positive number.")
+        if max_pending is not None and max_pending < 1:
+            raise IllegalArgumentError(f"Invalid high-water mark: {max_pending}. Expected a positive number.")
+
+        self._pipeline_factory: Callable[[], Pipeline] = pipeline_factory
+        self._source: Source = source
+        self._backend: QueueBackend = backend
+        self._workers: int = workers
+        self._batch_size: int = batch_size
+        self._lease_timeout: float = lease_timeout
+        self._poll_interval: float = poll_interval
+        self._max_restarts: int = max_restarts if max_restarts is not None else workers * 3
+        self._merge: Optional[Callable[[List[object]], object]] = merge
+        self._context_provider: PipelineContextProvider = context_provider
+        self._mp = multiprocessing.get_context(start_method)
+        self._tuner: Optional[AdaptiveController] = tuner
+        self._max_attempts: int = max_attempts
+        self._max_pending: Optional[int] = max_pending
+
+        # Items given up on during last execution.
+        self._failures: List[ItemFailure] = []
+
+        # Worker processes (by slot), number of active slots and number of restarts so far.
+        self._processes: List[multiprocessing.Process] = []
+        self._active_workers: int = workers
+        self._restarts: int = 0
+
+    @property
+    def failures(self) -> List[ItemFailure]:
+        """
+        :return: Items given up on during last execution (see 'max_attempts'), in source order.
+        """
+        return list(self._failures)
+
+    def run(self) -> Optional[object]:
+        """
+        Execute the pipeline over all items provided by the source.
+
+        :return: Merged results, or None if a command aborted the pipeline.
+        :raises IllegalStateError: If workers died more times than allowed, or if results were lost.
+        """
+        backend: QueueBackend = self._backend
+        results: Dict[int, object] = {}
+        published: int = 0
+        aborted: bool = False
+
+        backend.setup()
+        self._source.setup()
+        try:
+            self._active_workers = self._workers
+            if self._tuner:
+                self._tuner.start(self._workers, self._batch_size)
+                self._apply(self._tuner.workers, self._tuner.batch_size)
+
+            self._processes = [self._start_worker(slot) for slot in range(self._active_workers)]
+            self._restarts = 0
+
+            # Publish all items, collecting results as they arrive.
+            for payloads in self._read_batches():
+                aborted = self._throttle(results)
+                if aborted:
+                    break
+
+                published += len(backend.put_many(payloads))
+                self._step(results)
+
+            if not aborted:
+                backend.set_flag(CLOSED_FLAG, "1")
+                aborted = self._wait(results, published)
+
+        finally:
+            backend.set_flag(CLOSED_FLAG, "1")
+            self._stop_workers()
+            self._source.cleanup()
+            backend.cleanup()
+
+        if aborted:
+            return None
+
+        ordered: List[object] = []
+        self._failures = []
+        for index, item_id in enumerate(sorted(results)):
+            result: object = results[item_id]
+            if isinstance(result, _FailureMarker):
+                self._failures.append(ItemFailure(index, result.error))
+            else:
+                ordered.append(result)
+
+        return self._merge(ordered) if self._merge else ordered
+
+    def _read_batches(self) -> Iterator[List[bytes]]:
+        """
+        Read all items from the source.
+
+        :return: Iterator over batches of serialized items.
+        """
+        size: int = min(_PUBLISH_BATCH_SIZE, self._max_pending) if self._max_pending else _PUBLISH_BATCH_SIZE
+        payloads: List[bytes] = []
+
+        context: CTX = self._context_provider.create_context()
+        while self._source.next(context):
+            attributes: Dict[str, object] = {name: context.get(name) for name in self._source.provides}
+            payloads.append(pickle.dumps(attributes))
+            if len(payloads) >= size:
+                yield payloads
+                payloads = []
+
+        if payloads:
+            yield payloads
+
+    def _throttle(self, results: Dict[int, object]) -> bool:
+        """
+        Wait while the number of items not acknowledged yet is at the high-water mark (if defined).
+
+        :return: True if execution was aborted.
+        """
+        while self._max_pending is not None and self._backend.pending_count() >= self._max_pending:
+            if self._aborted:
+                return True
+            if not self._step(results):
+                time.sleep(self._poll_interval)
+
+        return self._aborted
+
+    def _wait(self, results: Dict[int, object], published: int) -> bool:
+        """
+        Wait for results of all published items.
+
+        :return: True if execution was aborted.
+        :raises IllegalStateError: If all items were acknowledged, but some results are missing.
+        """
+        while len(results) < published:
+            if self._aborted:
+                return True
+
+            # Once no item is pending, all results are available to collect.
+            pending: int = self._backend.pending_count()
+            collected: bool = self._step(results)
+            if pending == 0 and len(results) < published:
+                raise IllegalStateError(f"All items were acknowledged, but {published - len(results)} result(s) are "
+                                        f"missing (last worker error: {self._last_error}).")
+
+            if not collected:
+                time.sleep(self._poll_interval)
+
+        return False
+
+    def _step(self, results: Dict[int, object]) -> bool:
+        """
+        Collect available results, and (unless execution was aborted) restart dead workers and tune settings.
+
+        :return: True if any result was collected.
+        """
+        collected: bool = self._collect(results)
+        if not self._aborted:
+            self._supervise()
+            self._tune(len(results))
+
+        return collected
+
+    @property
+    def _aborted(self) -> bool:
+        """
+        :return: True if a command aborted the pipeline in any worker.
+        """
+        return self._backend.get_flag(ABORTED_FLAG) is not None
+
+    @property
+    def _last_error(self) -> Optional[str]:
+        """
+        :return: The last error raised within a worker, if any.
+        """
+        return self._backend.get_flag(ERROR_FLAG)
+
+    def _collect(self, results: Dict[int, object]) -> bool:
+        """
+        Collect available results from the backend.
+
+        :return: True if any result was collected.
+        """
+        collected: List[Tuple[int, bytes]] = self._backend.collect()
+        for item_id, payload in collected:
+            results[item_id] = pickle.loads(payload)
+
+        return len(collected) > 0
+
+    def _supervise(self):
+        """
+        Restart workers of active slots that died. A worker that exited gracefully while work remains (since it
+        observed a retirement of its slot that was later reverted) is restarted as well.
+        """
+        for slot, process in enumerate(self._processes[:self._active_workers]):
+            if process.exitcode is None:
+                continue
+
+            if process.exitcode != 0:
+                self._restarts += 1
+                if self._restarts > self._max_restarts:
+                    raise IllegalStateError(f"Workers died {self._restarts} times (last exit code: "
+                                            f"{process.exitcode}, last error: {self._last_error}). "
+                                            f"Aborting execution.")
+            elif self._backend.pending_count() == 0:
+                continue
+
+            self._processes[slot] = self._start_worker(slot)
+
+    def _tune(self, completed: int):
+        """
+        Let the tuner (if defined) adjust number of workers and batch size.
+
+        :param completed: Number of items completed so far.
+        """
+        if self._tuner is None or not self._tuner.due:
+            return
+
+        decision = self._tuner.observe(completed, self._backend.pending_count())
+        if decision is None:
+            return
+
+        self._apply(decision.workers, decision.batch_size)
+
+        # Start workers for slots never activated before. Workers of retired slots exit on their own, and those of
+        # reactivated slots are restarted by '_supervise' (so restarts of dead workers count towards the limit).
+        while len(self._processes) < self._active_workers:
+            self._processes.append(self._start_worker(len(self._processes)))
+
+        self._supervise()
+
+    def _apply(self, workers: int, batch_size: int):
+        """
+        Publish new settings to workers.
+        """
+        self._active_workers = workers
+        self._backend.set_flag(BATCH_SIZE_FLAG, str(batch_size))
+        self._backend.set_flag(WORKERS_FLAG, str(workers))
+
+    def _start_worker(self, slot: int) -> multiprocessing.Process:
+        process = self._mp.Process(target=run_worker,
+                                   args=(self._pipeline_factory, self._backend, None, self._batch_size,
+                                         self._lease_timeout, self._poll_interval, slot, self._max_attempts),
+                                   daemon=True)
+        process.start()
+        return process
+
+    def _stop_workers(self):
+        """
+        Wait for workers to exit, terminating those that do not exit in a timely manner.
+        """
+        for process in self._processes:
+            process.join(timeout=max(self._poll_interval * 10, 1.0))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+        self._processes = []
@@ -1,17 +1,27 @@
-from typing import Generic, List, Set, Optional, TypeVar
+import threading
+from typing import Generic, List, Set, Optional, TypeVar, Union, Tuple, Iterable
 
-from pyper.exceptions import IllegalStateError
+from pyper.exceptions import IllegalStateError, IllegalArgumentError
 from .callbacks import LifecycleAware
-from .command import Command
+from .cancellation import CancellationToken
+from .command import Command, FusedCommand
 from .context import CTX, PipelineContextProvider
 from .exceptions import MissingRequirementsException, AbortPipeline
+from .progress import ProgressReporter
 from .sink import Sink
 from .source import Source
+from .utils import to_set
 
 # Pipeline execution results.
 PIPE_R = TypeVar("PIPE_R")
 
 
+class _CycleInterrupted(Exception):
+    """
+    Raised internally when a cycle in progress is interrupted by a cancellation without draining.
+    """
+
+
 class OneTimeSource(Source[CTX]):
     """
     A data source used as a synthetic when no actual data source is provided.
@@ -23,6 +33,10 @@ class OneTimeSource(Source[CTX]):
         # Counts the number of times this source was used.
         self._count: int = 0
 
+    @property
+    def estimated_size(self) -> Optional[int]:
+        return 1
+
     def setup(self):
         self._count = 0
 
@@ -40,12 +54,20 @@ class Pipeline(Generic[CTX]):
 
     def __init__(self, source: Source = None,
                  sink: Sink = None,
-                 context_provider: PipelineContextProvider = PipelineContextProvider()):
+                 context_provider: PipelineContextProvider = PipelineContextProvider(),
+                 inputs: Optional[Union[Set, List, Tuple, object]] = None,
+                 fuse_commands: bool = True,
+                 progress: Optional[ProgressReporter] = None):
         """
         Class initializer.
 
         :param source: Optional source that pumps data into the pipeline.
         :param sink: A collector of data called after all commands to extract results.
+        :param context_provider: Factory creating the context of each pipeline execution.
+        :param inputs: Optional list of properties provided from outside the pipeline (e.g.: items pushed via a
+        session) rather than by the source.
+        :param fuse_commands: Whether runs of adjacent fusable commands should be fused into a single command.
+        :param progress: Optional reporter of execution progress.
         """
 
         # Optional pipeline source.
@@ -60,8 +82,22 @@ class Pipeline(Generic[CTX]):
         # List of commands to execute on every cycle.
         self._commands: List[Command[CTX]] = []
 
+        # Properties provided from outside the pipeline.
+        self._inputs: Set[str] = set(to_set(inputs))
+
         # Requirements provided by all existing commands.
-        self._available_requirements: Set[str] = set()
+        self._available_requirements: Set[str] = set(self._inputs)
+
+        # Whether adjacent fusable commands are fused.
+        self._fuse_commands: bool = fuse_commands
+
+        # Optional progress reporter.
+        self._progress: Optional[ProgressReporter] = progress
+
+        # Cancellation token of current execution or session (if any), and an indication that none is in progress.
+        self._cancellation: Optional[CancellationToken] = None
+        self._idle: threading.Event = threading.Event()
+        self._idle.set()
 
         # Holds all the objects we need to inform during setup/cleanup phases, typically -- source, sink and commands.
         self._callbacks: List[LifecycleAware] = []
@@ -77,26 +113,37 @@ class Pipeline(Generic[CTX]):
         if self._sink:
             self._callbacks.append(self._sink)
 
-    def add_command(self, command: Command[CTX]):
+    def add_command(self, command: Command[CTX], validate: bool = True):
         """
-        Add a new command to the pipeline.
+        Add a new command to the pipeline. If both the command and the previously added one are fusable, they
+        are fused into a single command.
 
         :param command: Command to add.
+        :param validate: Whether to make sure the command's requirements are fulfilled. May be turned off when
+        requirements are known to be valid (e.g.: when building a pipeline from an already validated spec).
         :raises MissingRequirementsException: If the command has a requirement that is not fulfilled by previously
         added command.
         """
 
-        requirements: Set[str] = command.requires - self._available_requirements
+        requirements: Set[str] = command.requires - self._available_requirements if validate else set()
         if len(requirements) > 0:
             raise MissingRequirementsException(
                 f"Command '{command.__class__.__name__}' has unfulfilled requirement(s): '{','.join(requirements)}'.")
 
-        self._commands.append(command)
+        last: Optional[Command[CTX]] = self._commands[-1] if self._commands else None
+        if self._fuse_commands and command.fusable and last is not None and last.fusable:
+            members: List[Command[CTX]] = list(last.commands) if isinstance(last, FusedCommand) else [last]
+            self._commands[-1] = FusedCommand(members + [command])
+        else:
+            self._commands.append(command)
+
         self._available_requirements.update(command.provides)
 
         self._callbacks.append(command)
 
-    def run(self) -> Optional[PIPE_R]:
+    def run(self,
+            cancellation_token: Optional[CancellationToken] = None,
+            time_limit: Optional[float] = None) -> Optional[PIPE_R]:
         """
         Execute a pipeline:
             - Execute setup lifecycle callback to all objects.
@@ -104,50 +151,150 @@ class Pipeline(Generic[CTX]):
             - Execute the commands - one by one.
             - Execute cleanup lifecycle callback to all objects.
 
+        Execution may be cancelled via a cancellation token, a time limit or a call to 'stop'. The token is checked
+        before pulling each item from the source. Cancelled executions still issue cleanup callbacks and return the
+        results gathered so far.
+
+        :param cancellation_token: Optional token to cancel execution with.
+        :param time_limit: Optional number of seconds after which execution is cancelled (with draining).
         :return: Optionally, a result, if a Sink was defined.
         """
+        token: CancellationToken = cancellation_token if cancellation_token else CancellationToken()
+        if time_limit is not None:
+            token.cancel_after(time_limit)
 
-        # Before pipeline execution begins, issue setup callbacks on all objects.
-        self._issue_setup_callback()
+        self._cancellation = token
+        self._idle.clear()
 
+        # Before pipeline execution begins, issue setup callbacks on all objects.
         try:
-            context: CTX = self._context_provider.create_context()
-
-            while self._source.next(context):
-                # Call commands.
-                for cmd in self._commands:
-                    cmd_name: str = cmd.__class__.__name__
+            self._issue_setup_callback()
+        except BaseException:
+            self._cancellation = None
+            self._idle.set()
+            raise
 
-                    results: bool = cmd.handle(context)
-                    if results is not None and not isinstance(results, bool):
-                        raise IllegalStateError(f"Command {cmd_name} returned an unexpected results (type: "
-                                                f"{type(results)}). Expected either bool or None.")
+        progress: Optional[ProgressReporter] = self._progress
+        if progress is not None:
+            progress.start(self._source.estimated_size)
 
-                    # If the last command returned 'False', we need to skip the rest of the commands in this cycle.
-                    if not results:
-                        break
+        try:
+            context: CTX = self._context_provider.create_context()
 
-                    # Make sure that this command fulfills all requirements.
-                    undefined_properties: Set[str] = set(
-                        [prop_name for prop_name in cmd.provides if not context.has_attribute(prop_name)])
-                    if len(undefined_properties) > 0:
-                        raise MissingRequirementsException(f"Command {cmd.__class__.__name__} did not fulfill all "
-                                                           f"requirements (missing: {','.join(undefined_properties)}).")
+            while not token.cancelled and self._source.next(context):
+                completed: bool = self._run_cycle(context, token)
+                if progress is not None:
+                    progress.update(completed)
 
-                if self._sink:
-                    self._sink.handle(context)
+        except _CycleInterrupted:
+            # Execution was cancelled without draining -- results gathered so far are returned.
+            pass
 
         except AbortPipeline:
             # In case a command raised 'AbortPipeline' -- we are terminating gracefully and returning nothing to the
             # pipeline caller.
             return None
 
+        except BaseException as ex:
+            if progress is not None:
+                progress.fail()
+            self._issue_failure_callback(ex)
+            raise
+
         finally:
-            # After all cycles are done, issue cleanup callbacks.
-            self._issue_cleanup_callback()
+            # After all cycles are done, issue cleanup callbacks. The final progress report is issued afterwards, so a
+            # failing report callback cannot prevent cleanup.
+            try:
+                self._issue_cleanup_callback()
+            finally:
+                self._cancellation = None
+                self._idle.set()
+                if progress is not None:
+                    progress.finish()
 
         return self._sink.get_result() if self._sink else None
 
+    def stop(self, drain: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Request the execution (or session) in progress to stop: no more data is pulled from the source, cleanup
+        callbacks are issued and 'run' returns the results gathered so far. May be called from any thread, or from a
+        signal handler (without a timeout). Has no effect if the pipeline is not running.
+
+        :param drain: True to let the cycle in progress complete, False to interrupt it before its next command.
+        :param timeout: Optional number of seconds to wait for execution to stop. By default, does not wait.
+        :return: True if the pipeline is not running (anymore), False if still running.
+        """
+        token: Optional[CancellationToken] = self._cancellation
+        if token is not None:
+            token.cancel(drain)
+
+        return self._idle.wait(timeout) if timeout is not None else self._idle.is_set()
+
+    def session(self,
+                property_name: Optional[str] = None,
+                cancellation_token: Optional[CancellationToken] = None) -> 'PipelineSession[CTX]':
+        """
+        Create a long-lived session over this pipeline. Setup callbacks are issued once when the session is entered
+        and cleanup callbacks once when it exits, so that items can be processed one by one without paying for
+        setup/tear-down on every call::
+
+            with pipeline.session("item") as s:
+                result = s.process(item)
+
+        :param property_name: Optional name of the context attribute each processed item is set into. Must be one of
+        the pipeline's inputs or a property provided by its source. Defaults to the pipeline's input, if it has
+        exactly one.
+        :param cancellation_token: Optional token to cancel the session with (see 'PipelineSession.process_context').
+        :return: A new session object, to be used as a context manager.
+        :raises IllegalArgumentError: If the property is neither an input of the pipeline nor provided by its source.
+        """
+        if property_name is None:
+            if len(self._inputs) == 1:
+                property_name = next(iter(self._inputs))
+        elif property_name not in self._inputs and property_name not in self._source.provides:
+            raise IllegalArgumentError(f"Property '{property_name}' is neither an input of the pipeline nor provided "
+                                       f"by its source.")
+
+        return PipelineSession(self, property_name, cancellation_token)
+
+    def _run_cycle(self, context: CTX, token: Optional[CancellationToken] = None) -> bool:
+        """
+        Execute a single pipeline cycle: call all commands, one by one, followed by the sink (if defined).
+
+        :param context: Context to execute the cycle with.
+        :param token: Optional cancellation token, interrupting the cycle if cancelled without draining.
+        :return: True if all commands were executed, False if a command skipped the rest of the cycle.
+        :raises _CycleInterrupted: If the cycle was interrupted.
+        """
+        completed: bool = True
+        for cmd in self._commands:
+            if token is not None and token.interrupted:
+                raise _CycleInterrupted()
+
+            cmd_name: str = cmd.__class__.__name__
+
+            results: bool = cmd.handle(context)
+            if results is not None and not isinstance(results, bool):
+                raise IllegalStateError(f"Command {cmd_name} returned an unexpected results (type: "
+                                        f"{type(results)}). Expected either bool or None.")
+
+            # If the last command returned 'False', we need to skip the rest of the commands in this cycle.
+            if not results:
+                completed = False
+                break
+
+            # Make sure that this command fulfills all requirements.
+            undefined_properties: Set[str] = set(
+                [prop_name for prop_name in cmd.provides if not context.has_attribute(prop_name)])
+            if len(undefined_properties) > 0:
+                raise MissingRequirementsException(f"Command {cmd.__class__.__name__} did not fulfill all "
+                                                   f"requirements (missing: {','.join(undefined_properties)}).")
+
+        if self._sink:
+            self._sink.handle(context)
+
+        return completed
+
     def _issue_setup_callback(self):
         """
         Call setup callback for all listeners.
@@ -155,6 +302,20 @@ class Pipeline(Generic[CTX]):
         for c in self._callbacks:
             c.setup()
 
+    # noinspection PyBroadException
+    def _issue_failure_callback(self, error: BaseException):
+        """
+        Call failure callbacks for all listeners. If any callback raises exception, this exception is silently
+        ignored.
+
+        :param error: The exception that failed the execution.
+        """
+        for c in self._callbacks:
+            try:
+                c.failed(error)
+            except BaseException:
+                pass
+
     # noinspection PyBroadException
     def _issue_cleanup_callback(self):
         """
@@ -167,3 +328,172 @@ class Pipeline(Generic[CTX]):
             except BaseException:
                 # We ignore all types of exceptions here, so we can issue cleanup callbacks for all listeners.
                 pass
+
+
+class PipelineSession(Generic[CTX]):
+    """
+    A long-lived ("warm") execution of a pipeline. Setup callbacks are issued once when the session starts and cleanup
+    callbacks are issued once when it ends. In between, items are pushed into the pipeline by the caller (rather than
+    pulled from the pipeline's source) and each one is processed in a cycle of its own, with a fresh context.
+    """
+
+    def __init__(self,
+                 pipeline: Pipeline[CTX],
+                 property_name: Optional[str] = None,
+                 cancellation_token: Optional[CancellationToken] = None):
+        """
+        Class initializer.
+
+        :param pipeline: Pipeline to execute.
+        :param property_name: Optional name of the context attribute each processed item is set into.
+        :param cancellation_token: Optional token to cancel the session with.
+        """
+
+        # The pipeline this session executes.
+        self._pipeline: Pipeline[CTX] = pipeline
+
+        # Name of the context attribute to set items into.
+        self._property_name: Optional[str] = property_name
+
+        # Indicates if the session was started (setup callbacks were issued) and not yet closed.
+        self._active: bool = False
+
+        # Cancellation token of this session.
+        self._token: Optional[CancellationToken] = cancellation_token
+
+    @property
+    def active(self) -> bool:
+        """
+        :return: True if the session accepts items for processing, False if not started or already closed.
+        """
+        return self._active
+
+    def __enter__(self) -> 'PipelineSession[CTX]':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # An exception escaping the session fails it (unlike a failure of a single item, which is raised to the caller
+        # of 'process' and leaves the session active).
+        if exc_val is not None and self._active:
+            self._pipeline._issue_failure_callback(exc_val)
+
+        self.close()
+
+    def start(self):
+        """
+        Start the session by issuing setup callbacks on all lifecycle-aware objects of the pipeline.
+
+        :raises IllegalStateError: If the session is already active.
+        """
+        if self._active:
+            raise IllegalStateError("Session is already active.")
+
+        pipeline: Pipeline[CTX] = self._pipeline
+        pipeline._issue_setup_callback()
+        if pipeline._progress is not None:
+            pipeline._progress.start()
+
+        if self._token is None:
+            self._token = CancellationToken()
+        pipeline._cancellation = self._token
+        pipeline._idle.clear()
+
+        self._active = True
+
+    def close(self):
+        """
+        Close the session by issuing cleanup callbacks on all lifecycle-aware objects of the pipeline. Closing an
+        inactive session has no effect.
+        """
+        if self._active:
+            self._active = False
+            try:
+                self._pipeline._issue_cleanup_callback()
+            finally:
+                self._pipeline._cancellation = None
+                self._pipeline._idle.set()
+                if self._pipeline._progress is not None:
+                    self._pipeline._progress.finish()
+
+    def new_context(self) -> CTX:
+        """
+        :return: A new context, created by the pipeline's context provider.
+        """
+        return self._pipeline._context_provider.create_context()
+
+    def process(self, item: object) -> Optional[PIPE_R]:
+        """
+        Process a single item in a pipeline cycle.
+
+        :param item: Item to process. If the session has a property name, the item is set into the context under this
+        name.
+        :return: Optionally, the result of the cycle, if a Sink was defined.
+        :raises IllegalStateError: If the session is not active.
+        """
+        context: CTX = self.new_context()
+        if self._property_name is not None:
+            context.set(self._property_name, item)
+
+        return self.process_context(context)
+
+    def process_many(self, items: Iterable[object]) -> List[Optional[PIPE_R]]:
+        """
+        Process several items, each one in a pipeline cycle of its own. If a command aborts the pipeline or the
+        session is cancelled, the remaining items are not processed.
+
+        :param items: Items to process.
+        :return: List of results, one per processed item (in the same order as 'items').
+        :raises IllegalStateError: If the session is not active.
+        """
+        results: List[Optional[PIPE_R]] = []
+        for item in items:
+            results.append(self.process(item))
+            if not self._active:
+                break
+
+        return results
+
+    def process_context(self, context: CTX) -> Optional[PIPE_R]:
+        """
+        Execute a pipeline cycle over a context prepared by the caller.
+
+        If a command raises 'AbortPipeline', the session is closed and 'None' is returned.
+
+        The session's cancellation token (see 'Pipeline.stop') is checked before and after the cycle. If cancelled
+        before, the context is not processed, the session is closed and 'None' is returned. If cancelled during the
+        cycle, the session is closed once it completes (when draining) or the cycle is interrupted and 'None' is
+        returned. Note that an idle session is only closed by the next call.
+
+        :param context: Context to execute the cycle with.
+        :return: Optionally, the result of the cycle (see 'Sink.get_cycle_result'), if a Sink was defined.
+        :raises IllegalStateError: If the session is not active.
+        """
+        if not self._active:
+            raise IllegalStateError("Session is not active.")
+
+        token: CancellationToken = self._token
+        if token.cancelled:
+            self.close()
+            return None
+
+        pipeline: Pipeline[CTX] = self._pipeline
+        progress: Optional[ProgressReporter] = pipeline._progress
+        try:
+            completed: bool = pipeline._run_cycle(context, token)
+        except (AbortPipeline, _CycleInterrupted):
+            self.close()
+            return None
+        except BaseException:
+            if progress is not None:
+                progress.fail()
+            raise
+
+        if progress is not None:
+            progress.update(completed)
+
+        result: Optional[PIPE_R] = pipeline._sink.get_cycle_result() if pipeline._sink else None
+        if token.cancelled:
+            self.close()
+
+        return result
@@ -0,0 +1,171 @@
+import logging
+import time
+from typing import Callable, NamedTuple, Optional
+
+from pyper.exceptions import IllegalArgumentError
+
+__all__ = ['ProgressReport', 'ProgressReporter']
+
+
+class ProgressReport(NamedTuple):
+    """
+    A snapshot of pipeline execution progress.
+    """
+
+    # Number of cycles in which all commands were executed.
+    processed: int
+
+    # Number of cycles skipped by a command (returning 'False').
+    skipped: int
+
+    # Number of cycles that failed with an exception.
+    failed: int
+
+    # Number of seconds since execution started.
+    elapsed: float
+
+    # Moving average of cycles per second.
+    throughput: float
+
+    # Estimated total number of cycles, or None if unknown.
+    estimated_size: Optional[int]
+
+    # Estimated number of seconds until execution completes, or None if unknown.
+    eta: Optional[float]
+
+    @property
+    def total(self) -> int:
+        """
+        :return: Total number of cycles executed so far (processed, skipped and failed).
+        """
+        return self.processed + self.skipped + self.failed
+
+
+class ProgressReporter:
+    """
+    Tracks pipeline execution progress and periodically reports it, either to a callback or to a logger.
+
+    The pipeline calls 'update' once per cycle. Each call costs a counter increment, a read of the monotonic clock and
+    a comparison to the time of next report, so reports are issued on time regardless of how long cycles take.
+    """
+
+    def __init__(self,
+                 callback: Optional[Callable[[ProgressReport], None]] = None,
+                 interval: float = 10.0,
+                 smoothing: float = 0.3,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Class initializer.
+
+        :param callback: Optional callback to report progress to. If not provided, progress is logged.
+        :param interval: Minimal number of seconds between two reports.
+        :param smoothing: Weight of the most recent throughput sample in the moving average (0 < smoothing <= 1).
+        :param logger: Logger to report progress to, when no callback is provided. Defaults to this module's logger.
+        """
+        if interval <= 0:
+            raise IllegalArgumentError(f"Invalid interval: {interval}. Expected a positive number.")
+        if not 0 < smoothing <= 1:
+            raise IllegalArgumentError(f"Invalid smoothing factor: {smoothing}. Expected a value in range (0, 1].")
+
+        self._callback: Callable[[ProgressReport], None] = callback if callback else self._log
+        self._interval: float = interval
+        self._smoothing: float = smoothing
+        self._logger: logging.Logger = logger if logger else logging.getLogger(__name__)
+
+        self._estimated_size: Optional[int] = None
+        self._processed: int = 0
+        self._skipped: int = 0
+        self._failed: int = 0
+
+        # Time of next report.
+        self._next_report_time: float = 0.0
+
+        # Time execution started, time of last report and total number of cycles at that time.
+        self._start_time: float = 0.0
+        self._last_time: float = 0.0
+        self._last_total: int = 0
+
+        # Moving average of throughput (None until first sample).
+        self._throughput: Optional[float] = None
+
+    def start(self, estimated_size: Optional[int] = None):
+        """
+        Called by the pipeline when execution starts. Resets all counters.
+
+        :param estimated_size: Estimated total number of cycles, or None if unknown.
+        """
+        self._estimated_size = estimated_size
+        self._processed = self._skipped = self._failed = 0
+        self._start_time = self._last_time = time.monotonic()
+        self._next_report_time = self._start_time + self._interval
+        self._last_total = 0
+        self._throughput = None
+
+    def update(self, completed: bool):
+        """
+        Called by the pipeline after each cycle.
+
+        :param completed: True if all commands were executed, False if the cycle was skipped.
+        """
+        if completed:
+            self._processed += 1
+        else:
+            self._skipped += 1
+
+        if time.monotonic() >= self._next_report_time:
+            self._callback(self._sample())
+
+    def fail(self):
+        """
+        Called by the pipeline when a cycle fails with an exception.
+        """
+        self._failed += 1
+
+    def finish(self):
+        """
+        Called by the pipeline when execution completes. Issues a final report.
+        """
+        self._callback(self._sample())
+
+    def report(self) -> ProgressReport:
+        """
+        :return: A snapshot of current progress, without updating the throughput moving average.
+        """
+        return self._create_report(time.monotonic())
+
+    def _sample(self) -> ProgressReport:
+        """
+        Sample the throughput since last report, update the moving average and create a report.
+        """
+        now: float = time.monotonic()
+        total: int = self._processed + self._skipped + self._failed
+
+        if now > self._last_time:
+            rate: float = (total - self._last_total) / (now - self._last_time)
+            self._throughput = rate if self._throughput is None \
+                else self._smoothing * rate + (1 - self._smoothing) * self._throughput
+            self._last_time = now
+            self._last_total = total
+
+        self._next_report_time = now + self._interval
+        return self._create_report(now)
+
+    def _create_report(self, now: float) -> ProgressReport:
+        throughput: float = self._throughput if self._throughput is not None else 0.0
+        total: int = self._processed + self._skipped + self._failed
+
+        eta: Optional[float] = None
+        if self._estimated_size is not None and throughput > 0:
+            eta = max(self._estimated_size - total, 0) / throughput
+
+        return ProgressReport(self._processed, self._skipped, self._failed, now - self._start_time, throughput,
+                              self._estimated_size, eta)
+
+    def _log(self, report: ProgressReport):
+        """
+        Default callback: log the report.
+        """
+        size: str = f"/{report.estimated_size}" if report.estimated_size is not None else ""
+        eta: str = f"{report.eta:.0f}s" if report.eta is not None else "unknown"
+        self._logger.info(f"Progress: {report.total}{size} (processed: {report.processed}, skipped: {report.skipped}, "
+                          f"failed: {report.failed}), {report.throughput:.1f} items/sec, ETA: {eta}.")
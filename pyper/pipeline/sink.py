@@ -31,3 +31,11 @@ class Sink(LifecycleAware, Generic[CTX]):
 
     def get_result(self) -> object:
         return self._result
+
+    def get_cycle_result(self) -> object:
+        """
+        :return: Result of the last cycle, used when items are processed one by one (e.g.: via a session). Defaults to
+        'get_result()', which fits sinks that overwrite their result on every cycle. Sinks accumulating results
+        across cycles should override this method.
+        """
+        return self.get_result()
@@ -27,6 +27,13 @@ class Source(ABC, LifecycleAware, Generic[CTX]):
         """
         return self._provides
 
+    @property
+    def estimated_size(self) -> Optional[int]:
+        """
+        :return: Estimated number of items this source provides, or None if unknown. Used for progress reporting.
+        """
+        return None
+
     @abstractmethod
     def next(self, context: CTX) -> bool:
         """
@@ -67,6 +74,13 @@ class SimpleListSource(Source[CTX]):
         # Index of current item to copy into context.
         self._index: int = 0
 
+    @property
+    def estimated_size(self) -> Optional[int]:
+        """
+        :return: Number of data items.
+        """
+        return len(self._data)
+
     def setup(self):
         self._index = 0
 
@@ -0,0 +1,217 @@
+from functools import lru_cache
+from importlib import import_module
+from typing import Dict, Hashable, List, Optional, Set, Tuple, Type, Union
+
+from pyper.exceptions import IllegalArgumentError
+from .pipeline import Pipeline
+
+__all__ = ['PipelineSpec']
+
+# Keys allowed in a pipeline definition.
+_DEFINITION_KEYS = {'source', 'sink', 'context_provider', 'commands', 'inputs', 'fuse_commands'}
+
+# Keys allowed in a component definition.
+_COMPONENT_KEYS = {'class', 'args', 'kwargs'}
+
+# Keys of definitions whose requirements were already validated within this process (see '_definition_key').
+_validated_definitions: Set[Hashable] = set()
+
+
+def _definition_key(value: object) -> Optional[Hashable]:
+    """
+    Create a hashable key representing a definition, so equal definitions share the same key.
+
+    :param value: Definition (or part of it).
+    :return: Hashable key, or None if the definition contains an unhashable value.
+    """
+    if isinstance(value, dict):
+        items = [(key, _definition_key(item)) for key, item in value.items()]
+        return None if any(key is None for _, key in items) else ('dict', frozenset(items))
+
+    if isinstance(value, (list, tuple)):
+        items = [_definition_key(item) for item in value]
+        return None if any(key is None for key in items) else ('list', tuple(items))
+
+    if isinstance(value, (set, frozenset)):
+        return ('set', frozenset(value))
+
+    try:
+        hash(value)
+    except TypeError:
+        return None
+
+    # Distinguish values that are equal but of different types (e.g.: 1 and True).
+    return type(value), value
+
+
+@lru_cache(maxsize=None)
+def _resolve_class(class_path: str) -> Type:
+    """
+    Import a class by its fully-qualified name. Results are cached, so each module is imported (and each name is
+    looked-up) only once per process.
+
+    :param class_path: Fully-qualified class name, either 'package.module.ClassName' or 'package.module:ClassName'.
+    :return: Class object.
+    :raises IllegalArgumentError: If the class cannot be found.
+    """
+    if ':' in class_path:
+        module_name, _, class_name = class_path.partition(':')
+    else:
+        module_name, _, class_name = class_path.rpartition('.')
+
+    if not module_name or not class_name:
+        raise IllegalArgumentError(f"Invalid class name: '{class_path}'. Expected a fully-qualified class name.")
+
+    try:
+        return getattr(import_module(module_name), class_name)
+    except (ImportError, AttributeError) as ex:
+        raise IllegalArgumentError(f"Cannot resolve class '{class_path}': {ex}.")
+
+
+class _ComponentSpec:
+    """
+    A validated definition of a single pipeline component (source, sink, context provider or command).
+    """
+
+    def __init__(self, definition: Union[str, Type, Dict], role: str):
+        """
+        Class initializer.
+
+        :param definition: Either a class (or fully-qualified class name) or a dictionary with a mandatory 'class' key
+        and optional 'args' (list) and 'kwargs' (dictionary) keys.
+        :param role: Role of component within the pipeline, used for error messages.
+        :raises IllegalArgumentError: If the definition is invalid.
+        """
+        if not isinstance(definition, dict):
+            definition = {'class': definition}
+
+        unknown_keys = set(definition.keys()) - _COMPONENT_KEYS
+        if len(unknown_keys) > 0:
+            raise IllegalArgumentError(f"Unknown key(s) in {role} definition: '{','.join(unknown_keys)}'.")
+
+        cls = definition.get('class')
+        if not isinstance(cls, (str, type)):
+            raise IllegalArgumentError(f"Invalid {role} class: {cls}. Expected a class or a fully-qualified class name.")
+
+        args = definition.get('args', [])
+        if not isinstance(args, (list, tuple)):
+            raise IllegalArgumentError(f"Invalid {role} arguments type: {type(args)}. Expected a list.")
+
+        kwargs = definition.get('kwargs', {})
+        if not isinstance(kwargs, dict):
+            raise IllegalArgumentError(f"Invalid {role} keyword arguments type: {type(kwargs)}. Expected a dict.")
+
+        # Class of component or its fully-qualified name (resolved on first use).
+        self._class: Union[str, Type] = cls
+
+        # Initializer arguments.
+        self._args: Tuple = tuple(args)
+        self._kwargs: Dict = dict(kwargs)
+
+    def create(self) -> object:
+        """
+        Create a new instance of the component, importing its module on first use.
+
+        :return: New component instance.
+        """
+        if isinstance(self._class, str):
+            self._class = _resolve_class(self._class)
+
+        return self._class(*self._args, **self._kwargs)
+
+
+class PipelineSpec:
+    """
+    A declarative pipeline definition. A definition is a dictionary naming the classes that compose the pipeline,
+    along with their initializer arguments::
+
+        spec = PipelineSpec({
+            "source": {"class": "myapp.sources.ImageLoaderDataSource", "args": ["/var/data/images"]},
+            "sink": {"class": "myapp.sinks.ImageWriterSink", "kwargs": {"path": "/tmp/images"}},
+            "commands": [
+                {"class": "myapp.commands.ImageResizeCommand", "args": [1024, 768]},
+                "myapp.commands.CompressImageCommand"
+            ]
+        })
+
+        pipeline = spec.build()
+
+    Supported keys are 'source', 'sink', 'context_provider', 'commands' (list), as well as 'inputs' and
+    'fuse_commands' which are passed as-is to the pipeline initializer. Each component is defined either by a class,
+    a fully-qualified class name or a dictionary with 'class', 'args' and 'kwargs' keys.
+
+    The structure of a definition is validated upon construction, without importing anything. Component modules are
+    imported lazily, when 'build' is first called, so defining many specs is cheap and only those actually built pay
+    for their imports. Resolved classes are cached per process, and so is the result of requirements validation: once
+    a pipeline was successfully built from a definition, building it again -- from any spec with an equal definition
+    -- skips validation. Definitions holding unhashable arguments are validated on every build.
+    """
+
+    def __init__(self, definition: Dict):
+        """
+        Class initializer.
+
+        :param definition: Pipeline definition.
+        :raises IllegalArgumentError: If the definition is invalid.
+        """
+        if not isinstance(definition, dict):
+            raise IllegalArgumentError(f"Invalid definition type: {type(definition)}. Expected a dict.")
+
+        unknown_keys = set(definition.keys()) - _DEFINITION_KEYS
+        if len(unknown_keys) > 0:
+            raise IllegalArgumentError(f"Unknown key(s) in pipeline definition: '{','.join(unknown_keys)}'.")
+
+        commands = definition.get('commands', [])
+        if not isinstance(commands, (list, tuple)):
+            raise IllegalArgumentError(f"Invalid commands type: {type(commands)}. Expected a list.")
+
+        self._source: Optional[_ComponentSpec] = self._component(definition, 'source')
+        self._sink: Optional[_ComponentSpec] = self._component(definition, 'sink')
+        self._context_provider: Optional[_ComponentSpec] = self._component(definition, 'context_provider')
+        self._commands: List[_ComponentSpec] = [_ComponentSpec(cmd, 'command') for cmd in commands]
+
+        # Additional initializer arguments of the pipeline.
+        self._pipeline_kwargs: Dict = {key: definition[key] for key in ('inputs', 'fuse_commands') if key in definition}
+
+        # Key of this definition within the process-wide cache of validated definitions (None if not cacheable).
+        self._key: Optional[Hashable] = _definition_key(definition)
+
+    @staticmethod
+    def _component(definition: Dict, role: str) -> Optional[_ComponentSpec]:
+        """
+        :return: Component spec for a given role, or None if the definition does not define one.
+        """
+        return _ComponentSpec(definition[role], role) if definition.get(role) is not None else None
+
+    @property
+    def validated(self) -> bool:
+        """
+        :return: True if a pipeline was successfully built from this spec's definition (hence, its requirements are
+        valid).
+        """
+        return self._key is not None and self._key in _validated_definitions
+
+    def build(self) -> Pipeline:
+        """
+        Build a new pipeline from this spec. Each call creates new instances of all components.
+
+        :return: A new pipeline.
+        :raises IllegalArgumentError: If a component class cannot be resolved.
+        :raises MissingRequirementsException: If a command has a requirement not fulfilled by previous commands.
+        """
+        kwargs: Dict = dict(self._pipeline_kwargs)
+        if self._context_provider:
+            kwargs['context_provider'] = self._context_provider.create()
+
+        pipeline = Pipeline(self._source.create() if self._source else None,
+                            self._sink.create() if self._sink else None,
+                            **kwargs)
+
+        validated: bool = self.validated
+        for cmd in self._commands:
+            pipeline.add_command(cmd.create(), validate=not validated)
+
+        if self._key is not None:
+            _validated_definitions.add(self._key)
+
+        return pipeline
@@ -0,0 +1,185 @@
+import threading
+import time
+from typing import List
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from pyper.pipeline import *
+from pyper.pipeline.test.pipeline_test_helper import EmptyCommand
+
+
+class CountingSource(Source):
+    """
+    An endless source providing increasing numbers in the 'value' attribute.
+    """
+
+    def __init__(self):
+        super().__init__(provides="value")
+        self._count = 0
+
+    def next(self, context: Context) -> bool:
+        context.set("value", self._count)
+        self._count += 1
+        return True
+
+
+class ListSink(Sink):
+    """
+    A sink collecting the 'value' attribute of all cycles reaching it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._result: List[int] = []
+
+    def setup(self):
+        self._result = []
+
+    def handle(self, context: Context):
+        self._result.append(context.get("value"))
+
+
+class CancellationTest(TestCase):
+
+    def _create_pipeline(self, handler=None) -> Pipeline:
+        """
+        Create a pipeline over an endless source, with a given command followed by a command recording values.
+        """
+        self._handled: List[int] = []
+
+        def record(ctx: Context):
+            self._handled.append(ctx.get("value"))
+            return True
+
+        pipeline = Pipeline(CountingSource(), ListSink())
+        pipeline.add_command(EmptyCommand(handler))
+        pipeline.add_command(EmptyCommand(record))
+        return pipeline
+
+    def _stop_on(self, value: int, drain: bool):
+        """
+        :return: A command handler stopping the pipeline from another thread when a given value is processed.
+        """
+
+        def handler(ctx: Context):
+            if ctx.get("value") == value:
+                timer = threading.Timer(0, lambda: self._pipeline.stop(drain=drain))
+                timer.start()
+                timer.join()
+            return True
+
+        return handler
+
+    def test_should_drain_cycle_in_progress(self):
+        """
+        Test that once stopped with draining, the cycle in progress completes and no more data is pulled.
+        """
+        self._pipeline = self._create_pipeline(self._stop_on(3, drain=True))
+
+        self.assertEqual([0, 1, 2, 3], self._pipeline.run())
+        self.assertEqual([0, 1, 2, 3], self._handled)
+
+    def test_should_interrupt_cycle_in_progress(self):
+        """
+        Test that once stopped without draining, the cycle in progress is interrupted before its next command and its
+        sink is not called, while results of previous cycles are returned.
+        """
+        self._pipeline = self._create_pipeline(self._stop_on(3, drain=False))
+
+        self.assertEqual([0, 1, 2], self._pipeline.run())
+        self.assertEqual([0, 1, 2], self._handled)
+
+    def test_should_stop_from_another_thread(self):
+        """
+        Test that a pipeline stopped from a supervisor thread returns partial results and issues cleanup callbacks.
+        """
+        pipeline = self._create_pipeline(lambda ctx: time.sleep(0.001) or True)
+        pipeline._source.cleanup = MagicMock()
+
+        stopped: List[bool] = []
+        timer = threading.Timer(0.05, lambda: stopped.append(pipeline.stop(timeout=5)))
+        timer.start()
+        result = pipeline.run()
+        timer.join()
+
+        self.assertEqual(list(range(len(result))), result)
+        self.assertGreater(len(result), 0)
+        self.assertEqual([True], stopped)
+        pipeline._source.cleanup.assert_called_once()
+
+    def test_should_stop_at_time_limit(self):
+        """
+        Test that execution is cancelled once its time limit passes.
+        """
+        pipeline = self._create_pipeline(lambda ctx: time.sleep(0.001) or True)
+
+        started = time.monotonic()
+        result = pipeline.run(time_limit=0.05)
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(list(range(len(result))), result)
+
+    def test_should_not_pull_data_when_already_cancelled(self):
+        """
+        Test that no data is pulled when the token is cancelled (or expired) before execution starts.
+        """
+        pipeline = self._create_pipeline()
+
+        token = CancellationToken()
+        token.cancel()
+        self.assertEqual([], pipeline.run(token))
+        self.assertEqual([], pipeline.run(CancellationToken(timeout=0)))
+
+    def test_stop_should_report_whether_running(self):
+        """
+        Test that 'stop' returns False while the pipeline is still running, and True once it is not.
+        """
+        stopped: List[bool] = []
+
+        def handler(ctx: Context):
+            stopped.append(self._pipeline.stop())
+            return True
+
+        self._pipeline = self._create_pipeline(handler)
+
+        self.assertTrue(self._pipeline.stop())
+        self._pipeline.run()
+        self.assertEqual([False], stopped)
+        self.assertTrue(self._pipeline.stop(timeout=0))
+
+    def test_token_should_keep_earlier_deadline(self):
+        """
+        Test that a later deadline does not extend an earlier one, and that interrupting is never turned to draining.
+        """
+        token = CancellationToken(timeout=0)
+        token.cancel_after(60)
+        self.assertTrue(token.cancelled)
+        self.assertFalse(token.interrupted)
+
+        token.cancel(drain=False)
+        token.cancel(drain=True)
+        self.assertTrue(token.interrupted)
+
+    def test_should_close_cancelled_session(self):
+        """
+        Test that a cancelled session is closed, and remaining items are not processed.
+        """
+        processed: List[int] = []
+
+        def handler(ctx: Context):
+            processed.append(ctx.get("value"))
+            if ctx.get("value") == 2:
+                pipeline.stop()
+            return True
+
+        pipeline = Pipeline(sink=Sink(), inputs="value")
+        pipeline.add_command(EmptyCommand(handler))
+
+        cleanup = MagicMock()
+        pipeline._sink.cleanup = cleanup
+        with pipeline.session() as session:
+            self.assertEqual(2, len(session.process_many([1, 2, 3])))
+            self.assertEqual([1, 2], processed)
+            self.assertFalse(session.active)
+            cleanup.assert_called_once()
+            self.assertTrue(pipeline.stop(timeout=0))
@@ -0,0 +1,143 @@
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+from pyper.exceptions import IllegalArgumentError, IllegalStateError
+from pyper.pipeline import *
+from pyper.pipeline.test.pipeline_test_helper import EmptyCommand
+from pyper.pipeline.columnar import ColumnarContext, ColumnarContextProvider, CsvBlockSource, ParquetBlockSource, \
+    ColumnCommand, FilterRowsCommand, ColumnarSink
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+CSV = "id,price,quantity,name\n1,10.0,2,a\n2,150.0,1,b\n3,200.0,3,c\n4,5.0,10,d\n5,300.0,1,e\n"
+
+
+class ColumnarTest(TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._directory.name, "data.csv")
+        with open(self._path, "w") as f:
+            f.write(CSV)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _source(self, **kwargs) -> CsvBlockSource:
+        return CsvBlockSource(self._path, types={"id": int, "price": float, "quantity": int}, **kwargs)
+
+    def test_should_read_csv_in_blocks(self):
+        """
+        Test that a CSV file is read in blocks, and all columns are provided by default.
+        """
+        source = self._source(block_size=2)
+        self.assertEqual({"id", "price", "quantity", "name"}, source.provides)
+
+        sizes = []
+        pipeline = Pipeline(source, ColumnarSink(["id", "name"]), context_provider=ColumnarContextProvider())
+        pipeline.add_command(EmptyCommand(lambda ctx: sizes.append(ctx.num_rows) or True))
+        result = pipeline.run()
+
+        self.assertEqual([2, 2, 1], sizes)
+        self.assertEqual([1, 2, 3, 4, 5], list(result["id"]))
+        self.assertEqual(["a", "b", "c", "d", "e"], list(result["name"]))
+
+    def test_should_compute_and_filter_columns(self):
+        """
+        Test that column commands compute new columns and filter rows of whole blocks, skipping empty blocks.
+        """
+        pipeline = Pipeline(self._source(block_size=2), ColumnarSink(["id", "total"]),
+                            context_provider=ColumnarContextProvider())
+        pipeline.add_command(FilterRowsCommand("price", lambda price: [p > 100 for p in price]))
+        pipeline.add_command(ColumnCommand(["price", "quantity"], "total",
+                                           lambda price, quantity: [p * q for p, q in zip(price, quantity)]))
+        result = pipeline.run()
+
+        self.assertEqual([2, 3, 5], list(result["id"]))
+        self.assertEqual([150.0, 600.0, 300.0], list(result["total"]))
+
+    def test_should_validate_column_requirements(self):
+        """
+        Test that requirements of column commands are validated against column names.
+        """
+        pipeline = Pipeline(self._source(columns=["id", "price"]), context_provider=ColumnarContextProvider())
+
+        with self.assertRaises(MissingRequirementsException):
+            pipeline.add_command(ColumnCommand("quantity", "double", lambda quantity: quantity))
+
+        pipeline.add_command(ColumnCommand("price", "double", lambda price: [p * 2 for p in price]))
+        pipeline.add_command(FilterRowsCommand("double", lambda double: [d > 0 for d in double]))
+
+    def test_should_fail_on_missing_csv_column(self):
+        """
+        Test that reading a CSV file lacking a requested column fails.
+        """
+        pipeline = Pipeline(CsvBlockSource(self._path, columns=["id", "color"]),
+                            context_provider=ColumnarContextProvider())
+
+        self.assertRaises(IllegalStateError, pipeline.run)
+
+    def test_should_require_columnar_context(self):
+        """
+        Test that a block source fails with a context that is not columnar.
+        """
+        self.assertRaises(IllegalStateError, Pipeline(self._source()).run)
+
+    def test_context_should_validate_column_length(self):
+        """
+        Test that columns (and masks) must match the number of rows in the block, and that a new block drops previous
+        columns.
+        """
+        context = ColumnarContext()
+        context.reset(2)
+        context.set_column("a", [1, 2])
+        context.set_column("b", [3, 4])
+
+        self.assertRaises(IllegalArgumentError, context.set_column, "c", [1, 2, 3])
+        self.assertRaises(IllegalArgumentError, context.filter, [True])
+
+        context.filter([False, True])
+        self.assertEqual([{"a": 2, "b": 4}], list(context.rows()))
+
+        context.reset(1)
+        self.assertFalse(context.has_attribute("a"))
+        self.assertEqual([], context.column_names)
+
+    @unittest.skipUnless(numpy, "NumPy is not installed.")
+    def test_should_compute_vectorized_columns(self):
+        """
+        Test that columns are NumPy arrays, so commands may compute whole columns at once.
+        """
+        pipeline = Pipeline(self._source(), ColumnarSink("total"), context_provider=ColumnarContextProvider())
+        pipeline.add_command(FilterRowsCommand("price", lambda price: price > 100))
+        pipeline.add_command(ColumnCommand(["price", "quantity"], "total", lambda price, quantity: price * quantity))
+        result = pipeline.run()
+
+        self.assertIsInstance(result["total"], numpy.ndarray)
+        self.assertEqual([150.0, 600.0, 300.0], result["total"].tolist())
+
+    @unittest.skipUnless(pyarrow, "PyArrow is not installed.")
+    def test_should_read_parquet_in_blocks(self):
+        """
+        Test that a Parquet file is read in blocks.
+        """
+        path = os.path.join(self._directory.name, "data.parquet")
+        pyarrow.parquet.write_table(pyarrow.table({"id": [1, 2, 3], "price": [1.0, 2.0, 3.0]}), path)
+
+        source = ParquetBlockSource(path, block_size=2)
+        self.assertEqual({"id", "price"}, source.provides)
+        self.assertEqual(2, source.estimated_size)
+
+        pipeline = Pipeline(source, ColumnarSink("id"), context_provider=ColumnarContextProvider())
+        self.assertEqual([1, 2, 3], list(pipeline.run()["id"]))
@@ -0,0 +1,73 @@
+from concurrent.futures import Future
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from pyper.exceptions import IllegalArgumentError
+from pyper.pipeline import *
+from pyper.pipeline.test.pipeline_test_helper import EmptyCommand
+
+
+class ContextTest(TestCase):
+
+    def test_should_compute_lazy_attribute_once(self):
+        """
+        Test that a lazy attribute is computed on first access only and then memoized.
+        """
+        thunk = MagicMock(return_value=42)
+        context = Context()
+        context.set_lazy("value", thunk)
+
+        self.assertTrue(context.has_attribute("value"))
+        thunk.assert_not_called()
+
+        self.assertEqual(42, context.get("value"))
+        self.assertEqual(42, context.get("value"))
+        thunk.assert_called_once()
+        self.assertFalse(context.is_lazy("value"))
+
+    def test_should_resolve_future_attribute(self):
+        """
+        Test that a future can serve as a lazy attribute.
+        """
+        future = Future()
+        future.set_result("done")
+        context = Context()
+        context.set_lazy("value", future)
+
+        self.assertEqual("done", context.get("value"))
+
+    def test_should_override_lazy_attribute(self):
+        """
+        Test that setting a value over a lazy attribute discards the lazy provider.
+        """
+        thunk = MagicMock(return_value=1)
+        context = Context()
+        context.set_lazy("value", thunk)
+        context.set("value", 2)
+
+        self.assertEqual(2, context.get("value"))
+        thunk.assert_not_called()
+
+    def test_should_reject_invalid_provider(self):
+        """
+        Test that a lazy value provider must be a callable or a future.
+        """
+        with self.assertRaises(IllegalArgumentError):
+            Context().set_lazy("value", 1)
+
+    def test_lazy_attribute_should_fulfill_requirements(self):
+        """
+        Test that a lazy attribute fulfills 'provides' validation without being computed.
+        """
+        thunk = MagicMock(return_value=1)
+
+        def provide(ctx: Context):
+            ctx.set_lazy("value", thunk)
+            return True
+
+        pipeline = Pipeline()
+        pipeline.add_command(EmptyCommand(provide, provides={"value"}))
+        pipeline.add_command(EmptyCommand(lambda ctx: True, requires={"value"}))
+        pipeline.run()
+
+        thunk.assert_not_called()
@@ -0,0 +1,111 @@
+import os
+import tempfile
+from typing import List
+from unittest import TestCase
+
+from pyper.pipeline import *
+from pyper.pipeline.dedup import DeduplicateCommand, LRUKeyIndex, BloomFilterIndex, SqliteKeyIndex, KeyIndex
+from pyper.pipeline.source import SimpleListSource
+from pyper.pipeline.test.pipeline_test_helper import EmptyCommand
+
+
+class DeduplicateTest(TestCase):
+
+    def _run(self, values: List, index: KeyIndex, fail_on=None) -> List:
+        """
+        Execute a pipeline deduplicating a list of values.
+
+        :param fail_on: Optional value failing the execution when reached.
+        :return: List of values that reached the command following the deduplication command.
+        """
+        passed: List = []
+
+        def collect(ctx: Context):
+            if ctx.get("value") == fail_on:
+                raise ValueError(f"Failed on {fail_on}")
+            passed.append(ctx.get("value"))
+            return True
+
+        dedup = DeduplicateCommand("value", index)
+        pipeline = Pipeline(SimpleListSource("value", values))
+        pipeline.add_command(dedup)
+        pipeline.add_command(EmptyCommand(collect))
+        pipeline.add_command(dedup.recorder())
+        pipeline.run()
+
+        return passed
+
+    def test_should_skip_duplicates(self):
+        """
+        Test that duplicate values are skipped.
+        """
+        self.assertEqual([1, 2, 3], self._run([1, 2, 1, 3, 2, 3], LRUKeyIndex()))
+
+    def test_lru_index_should_evict_oldest_key(self):
+        """
+        Test that a bounded LRU index forgets least-recently seen keys.
+        """
+        index = LRUKeyIndex(max_size=2)
+
+        self.assertTrue(index.add(b"a"))
+        self.assertTrue(index.add(b"b"))
+        self.assertTrue(index.add(b"c"))
+        self.assertFalse(index.add(b"c"))
+        self.assertTrue(index.add(b"a"))
+
+    def test_bloom_filter_should_detect_duplicates(self):
+        """
+        Test that a Bloom filter detects all duplicates, with few false positives.
+        """
+        index = BloomFilterIndex(capacity=1000, error_rate=0.01)
+        index.setup()
+
+        new_keys = sum(index.add(str(i).encode()) for i in range(1000))
+        self.assertGreater(new_keys, 980)
+        self.assertFalse(any(index.add(str(i).encode()) for i in range(1000)))
+
+    def test_persistent_indices_should_detect_duplicates_across_runs(self):
+        """
+        Test that persistent indices detect duplicates seen by a previous pipeline execution.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            for index_factory in (lambda: SqliteKeyIndex(os.path.join(directory, "keys.db")),
+                                  lambda: BloomFilterIndex(1000, path=os.path.join(directory, "keys.bloom"))):
+                self.assertEqual([1, 2], self._run([1, 2, 1], index_factory()))
+                self.assertEqual([3], self._run([2, 3, 1], index_factory()))
+
+    def test_should_process_failed_item_again_on_retry(self):
+        """
+        Test that keys are recorded only for completed cycles, and that a failed execution does not persist keys, so a
+        retry processes all items that were not completed.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            for index_factory in (lambda: SqliteKeyIndex(os.path.join(directory, "keys.db")),
+                                  lambda: BloomFilterIndex(1000, path=os.path.join(directory, "keys.bloom"))):
+                self.assertRaises(ValueError, self._run, [1, 2, 3], index_factory(), fail_on=2)
+                self.assertEqual([1, 2, 3], self._run([1, 2, 3], index_factory()))
+                self.assertEqual([], self._run([1, 2, 3], index_factory()))
+
+    def test_should_not_record_skipped_cycles(self):
+        """
+        Test that a cycle skipped after deduplication is not recorded as seen.
+        """
+        index = LRUKeyIndex()
+        dedup = DeduplicateCommand("value", index)
+        pipeline = Pipeline(SimpleListSource("value", [1, 2]))
+        pipeline.add_command(dedup)
+        pipeline.add_command(EmptyCommand(lambda ctx: ctx.get("value") != 2))
+        pipeline.add_command(dedup.recorder())
+        pipeline.run()
+
+        context = Context()
+        context.set("value", 1)
+        self.assertTrue(index.contains(dedup.key(context)))
+        context.set("value", 2)
+        self.assertFalse(index.contains(dedup.key(context)))
+
+    def test_should_require_key_properties(self):
+        """
+        Test that key properties are declared as requirements.
+        """
+        self.assertEqual({"a", "b"}, DeduplicateCommand(["a", "b"]).requires)
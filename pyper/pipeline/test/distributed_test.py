@@ -0,0 +1,360 @@
+import os
+import pickle
+import tempfile
+import time
+from unittest import TestCase
+
+from pyper.exceptions import IllegalStateError
+from pyper.pipeline import *
+from pyper.pipeline.distributed import DistributedRunner, SqliteQueueBackend, run_worker, ItemFailure, CLOSED_FLAG, \
+    WORKERS_FLAG, ABORTED_FLAG, ERROR_FLAG
+from pyper.pipeline.exceptions import AbortPipeline
+from pyper.pipeline.source import SimpleListSource
+from pyper.pipeline.test.pipeline_test_helper import EmptyCommand
+from pyper.pipeline.tuning import AdaptiveController
+
+
+class ResultSink(Sink):
+    """
+    A sink providing the 'result' attribute.
+    """
+
+    def handle(self, context: Context):
+        self._result = context.get("result")
+
+
+def square(ctx: Context):
+    ctx.set("result", ctx.get("value") ** 2)
+    return True
+
+
+def create_pipeline() -> Pipeline:
+    """
+    Pipeline factory: squares 'value' into 'result'.
+    """
+    pipeline = Pipeline(sink=ResultSink(), inputs="value")
+    pipeline.add_command(EmptyCommand(square, requires={"value"}, provides={"result"}))
+    return pipeline
+
+
+def slow_square(ctx: Context):
+    time.sleep(0.002)
+    return square(ctx)
+
+
+def create_slow_pipeline() -> Pipeline:
+    pipeline = Pipeline(sink=ResultSink(), inputs="value")
+    pipeline.add_command(EmptyCommand(slow_square, requires={"value"}, provides={"result"}))
+    return pipeline
+
+
+def square_or_fail(ctx: Context):
+    """
+    Square 'value', failing on value 13 and aborting the pipeline on value 666.
+    """
+    if ctx.get("value") == 13:
+        raise ValueError("unlucky")
+    if ctx.get("value") == 666:
+        raise AbortPipeline()
+
+    return square(ctx)
+
+
+def create_failing_pipeline() -> Pipeline:
+    pipeline = Pipeline(sink=ResultSink(), inputs="value")
+    pipeline.add_command(EmptyCommand(square_or_fail, requires={"value"}, provides={"result"}))
+    return pipeline
+
+
+class LossyQueueBackend(SqliteQueueBackend):
+    """
+    A backend losing the first result it collects.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._lost = False
+
+    def collect(self):
+        results = super().collect()
+        if results and not self._lost:
+            self._lost = True
+            return results[1:]
+
+        return results
+
+
+class RecordingQueueBackend(SqliteQueueBackend):
+    """
+    A backend recording the maximal number of pending items right after publishing.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.max_pending = 0
+
+    def put_many(self, payloads):
+        ids = super().put_many(payloads)
+        self.max_pending = max(self.max_pending, self.pending_count())
+        return ids
+
+
+def die_once(ctx: Context):
+    """
+    Kill the worker process the first time value 3 is processed (a marker file records it happened).
+    """
+    marker: str = ctx.get("marker")
+    if ctx.get("value") == 3 and not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+
+    return square(ctx)
+
+
+def create_dying_pipeline() -> Pipeline:
+    pipeline = Pipeline(sink=ResultSink(), inputs={"value", "marker"})
+    pipeline.add_command(EmptyCommand(die_once, requires={"value", "marker"}, provides={"result"}))
+    return pipeline
+
+
+def create_broken_pipeline() -> Pipeline:
+    raise RuntimeError("broken factory")
+
+
+class MarkerSource(SimpleListSource):
+    """
+    A list source that also provides the path of a marker file.
+    """
+
+    def __init__(self, data, marker: str):
+        super().__init__("value", data)
+        self._provides = {"value", "marker"}
+        self._marker = marker
+
+    def next(self, context: Context) -> bool:
+        context.set("marker", self._marker)
+        return super().next(context)
+
+
+class SqliteQueueBackendTest(TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._backend = SqliteQueueBackend(os.path.join(self._directory.name, "queue.db"))
+        self._backend.setup()
+
+    def tearDown(self):
+        self._backend.cleanup()
+        self._directory.cleanup()
+
+    def test_should_redeliver_expired_lease(self):
+        """
+        Test that an item not acknowledged within its lease is delivered again, while an acknowledged one is not.
+        """
+        backend = self._backend
+        first = backend.put(b"1")
+        second = backend.put(b"2")
+
+        self.assertEqual([(first, b"1", 1), (second, b"2", 1)], backend.lease("w1", 10, lease_timeout=-1))
+        backend.ack(first, b"r1")
+
+        self.assertEqual([(second, b"2", 2)], backend.lease("w2", 10, lease_timeout=60))
+        self.assertEqual([], backend.lease("w3", 10, lease_timeout=60))
+        self.assertEqual(1, backend.pending_count())
+        self.assertEqual([(first, b"r1")], backend.collect())
+        self.assertEqual([], backend.collect())
+
+    def test_should_not_reuse_identifiers(self):
+        """
+        Test that the identifier of an acknowledged item is not reused by items published later.
+        """
+        backend = self._backend
+        first, second = backend.put_many([b"1", b"2"])
+        self.assertLess(first, second)
+
+        backend.lease("w1", 10, lease_timeout=60)
+        backend.ack(second, b"r2")
+
+        self.assertGreater(backend.put(b"3"), second)
+
+    def test_should_redeliver_released_item(self):
+        """
+        Test that a released item is delivered again without waiting for its lease to expire.
+        """
+        backend = self._backend
+        item_id = backend.put(b"1")
+        backend.lease("w1", 10, lease_timeout=60)
+        backend.release(item_id)
+
+        self.assertEqual([(item_id, b"1", 2)], backend.lease("w2", 10, lease_timeout=60))
+
+    def test_should_be_picklable(self):
+        """
+        Test that a backend with an open connection can be passed to another process.
+        """
+        self._backend.set_flag(CLOSED_FLAG, "1")
+        copy = pickle.loads(pickle.dumps(self._backend))
+
+        self.assertEqual("1", copy.get_flag(CLOSED_FLAG))
+        copy.cleanup()
+
+    def test_worker_should_retire_when_slot_is_inactive(self):
+        """
+        Test that a worker exits without processing items once its slot is retired.
+        """
+        backend = self._backend
+        backend.put(pickle.dumps({"value": 2}))
+        backend.set_flag(WORKERS_FLAG, "1")
+
+        run_worker(create_pipeline, backend, "worker", slot=1)
+
+        self.assertEqual(1, backend.pending_count())
+
+    def test_worker_should_process_items_until_closed(self):
+        """
+        Test that a worker processes all items and exits once the queue is closed.
+        """
+        backend = self._backend
+        for value in (2, 3):
+            backend.put(pickle.dumps({"value": value}))
+        backend.set_flag(CLOSED_FLAG, "1")
+
+        run_worker(create_pipeline, backend, "worker", batch_size=2)
+
+        self.assertEqual([4, 9], [pickle.loads(payload) for _, payload in sorted(backend.collect())])
+
+    def test_worker_should_give_up_on_failing_item(self):
+        """
+        Test that a worker retries a failing item up to the maximal number of attempts, then acknowledges it, and keeps
+        processing other items.
+        """
+        backend = self._backend
+        backend.put_many([pickle.dumps({"value": value}) for value in (2, 13, 3)])
+        backend.set_flag(CLOSED_FLAG, "1")
+
+        run_worker(create_failing_pipeline, backend, "worker", max_attempts=2)
+
+        results = [pickle.loads(payload) for _, payload in sorted(backend.collect())]
+        self.assertEqual(0, backend.pending_count())
+        self.assertEqual([4, 9], [results[0], results[2]])
+        self.assertEqual("worker: ValueError: unlucky", backend.get_flag(ERROR_FLAG))
+
+    def test_worker_should_flag_abort(self):
+        """
+        Test that a worker whose pipeline was aborted flags it and exits, leaving remaining items unprocessed.
+        """
+        backend = self._backend
+        backend.put_many([pickle.dumps({"value": value}) for value in (666, 2)])
+        backend.set_flag(CLOSED_FLAG, "1")
+
+        run_worker(create_failing_pipeline, backend, "worker", batch_size=2)
+
+        self.assertEqual("worker", backend.get_flag(ABORTED_FLAG))
+        self.assertEqual(2, backend.pending_count())
+
+
+class DistributedRunnerTest(TestCase):
+
+    def test_should_process_items_over_workers(self):
+        """
+        Test that all items are processed by workers and results are returned in source order.
+        """
+        values = list(range(20))
+        with tempfile.TemporaryDirectory() as directory:
+            runner = DistributedRunner(create_pipeline, SimpleListSource("value", values),
+                                       SqliteQueueBackend(os.path.join(directory, "queue.db")),
+                                       workers=2, batch_size=3, poll_interval=0.01)
+
+            self.assertEqual([v ** 2 for v in values], runner.run())
+
+    def test_should_process_items_with_tuner(self):
+        """
+        Test that all items are processed while a tuner adjusts workers and batch size.
+        """
+        values = list(range(200))
+        with tempfile.TemporaryDirectory() as directory:
+            runner = DistributedRunner(create_slow_pipeline, SimpleListSource("value", values),
+                                       SqliteQueueBackend(os.path.join(directory, "queue.db")),
+                                       workers=1, poll_interval=0.01,
+                                       tuner=AdaptiveController(max_workers=3, max_batch_size=8, interval=0.02))
+
+            with self.assertLogs("pyper.pipeline.tuning", "INFO") as logs:
+                self.assertEqual([v ** 2 for v in values], runner.run())
+
+            # Initially, a single worker processes a full queue, so the tuner adds workers.
+            self.assertIn("Tuning: workers 1 -> 2", logs.output[0])
+
+    def test_should_redeliver_items_of_dead_worker(self):
+        """
+        Test that items leased by a worker that died are processed by another worker.
+        """
+        values = [1, 2, 3, 4, 5]
+        with tempfile.TemporaryDirectory() as directory:
+            runner = DistributedRunner(create_dying_pipeline,
+                                       MarkerSource(values, os.path.join(directory, "marker")),
+                                       SqliteQueueBackend(os.path.join(directory, "queue.db")),
+                                       workers=2, lease_timeout=0.5, poll_interval=0.01, merge=sum)
+
+            self.assertEqual(sum(v ** 2 for v in values), runner.run())
+
+    def test_should_abort_when_workers_keep_dying(self):
+        """
+        Test that execution is aborted when workers died more times than allowed, reporting the last worker error.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            runner = DistributedRunner(create_broken_pipeline, SimpleListSource("value", [3]),
+                                       SqliteQueueBackend(os.path.join(directory, "queue.db")),
+                                       workers=1, lease_timeout=0.1, poll_interval=0.01, max_restarts=1)
+
+            with self.assertRaisesRegex(IllegalStateError, "RuntimeError: broken factory"):
+                runner.run()
+
+    def test_should_report_failed_items(self):
+        """
+        Test that items failing in all attempts are excluded from results and reported as failures.
+        """
+        values = [1, 13, 2]
+        with tempfile.TemporaryDirectory() as directory:
+            runner = DistributedRunner(create_failing_pipeline, SimpleListSource("value", values),
+                                       SqliteQueueBackend(os.path.join(directory, "queue.db")),
+                                       workers=2, poll_interval=0.01, max_attempts=2)
+
+            self.assertEqual([1, 4], runner.run())
+            self.assertEqual([ItemFailure(1, "ValueError: unlucky")], runner.failures)
+
+    def test_should_stop_on_abort(self):
+        """
+        Test that execution stops and returns None once a command aborts the pipeline in any worker.
+        """
+        values = [1, 666] + list(range(500))
+        with tempfile.TemporaryDirectory() as directory:
+            runner = DistributedRunner(create_failing_pipeline, SimpleListSource("value", values),
+                                       SqliteQueueBackend(os.path.join(directory, "queue.db")),
+                                       workers=2, poll_interval=0.01, max_pending=10)
+
+            self.assertIsNone(runner.run())
+
+    def test_should_pause_publishing_at_high_water_mark(self):
+        """
+        Test that the number of pending items is bounded by the high-water mark (up to a single publishing batch).
+        """
+        values = list(range(100))
+        with tempfile.TemporaryDirectory() as directory:
+            backend = RecordingQueueBackend(os.path.join(directory, "queue.db"))
+            runner = DistributedRunner(create_pipeline, SimpleListSource("value", values), backend,
+                                       workers=2, poll_interval=0.01, max_pending=10)
+
+            self.assertEqual([v ** 2 for v in values], runner.run())
+            self.assertLessEqual(backend.max_pending, 2 * 10)
+
+    def test_should_fail_when_results_are_lost(self):
+        """
+        Test that execution fails, rather than waits forever, when all items were acknowledged but results are missing.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            runner = DistributedRunner(create_pipeline, SimpleListSource("value", [1, 2, 3]),
+                                       LossyQueueBackend(os.path.join(directory, "queue.db")),
+                                       workers=1, poll_interval=0.01)
+
+            with self.assertRaises(IllegalStateError):
+                runner.run()
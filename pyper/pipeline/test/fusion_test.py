@@ -0,0 +1,108 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from pyper.pipeline import *
+from pyper.pipeline.test.pipeline_test_helper import EmptyCommand
+
+
+@fusable
+class IncrementCommand(Command):
+    """
+    A fusable command incrementing the 'value' attribute.
+    """
+
+    def __init__(self, requires=None, provides=None):
+        super().__init__(provides, requires)
+
+    def handle(self, context: Context) -> bool:
+        context.set("value", context.get("value", 0) + 1)
+        return True
+
+
+class ResultSink(Sink):
+    """
+    A sink providing the 'result' attribute.
+    """
+
+    def handle(self, context: Context):
+        self._result = context.get("result")
+
+
+class FusionTest(TestCase):
+
+    def test_should_fuse_adjacent_fusable_commands(self):
+        """
+        Test that adjacent fusable commands are fused, while other commands break the fused group.
+        """
+        pipeline = Pipeline()
+        pipeline.add_command(IncrementCommand())
+        pipeline.add_command(IncrementCommand())
+        pipeline.add_command(IncrementCommand())
+        pipeline.add_command(EmptyCommand())
+        pipeline.add_command(IncrementCommand())
+
+        # noinspection PyProtectedMember
+        commands = pipeline._commands
+        self.assertEqual(3, len(commands))
+        self.assertIsInstance(commands[0], FusedCommand)
+        self.assertEqual(3, len(commands[0].commands))
+
+    def test_should_not_fuse_when_disabled(self):
+        """
+        Test that fusion can be disabled.
+        """
+        pipeline = Pipeline(fuse_commands=False)
+        pipeline.add_command(IncrementCommand())
+        pipeline.add_command(IncrementCommand())
+
+        # noinspection PyProtectedMember
+        self.assertEqual(2, len(pipeline._commands))
+
+    def test_should_combine_requirements(self):
+        """
+        Test that a fused command requires only what its members do not provide to each other.
+        """
+        fused = FusedCommand([IncrementCommand(requires={"a"}, provides={"b"}),
+                              IncrementCommand(requires={"a", "b"}, provides={"c"})])
+
+        self.assertEqual({"a"}, fused.requires)
+        self.assertEqual({"b", "c"}, fused.provides)
+
+    def test_fused_commands_should_execute_in_order(self):
+        """
+        Test that all fused commands are executed and issued lifecycle callbacks.
+        """
+
+        def result(ctx: Context):
+            ctx.set("result", ctx.get("value"))
+            return True
+
+        commands = [IncrementCommand() for _ in range(5)]
+        for cmd in commands:
+            cmd.setup = MagicMock()
+
+        pipeline = Pipeline(sink=ResultSink())
+        for cmd in commands:
+            pipeline.add_command(cmd)
+        pipeline.add_command(EmptyCommand(result, provides={"result"}))
+
+        self.assertEqual(5, pipeline.run())
+        for cmd in commands:
+            cmd.setup.assert_called_once()
+
+    def test_fused_command_should_skip_on_false(self):
+        """
+        Test that a member returning 'False' skips the rest of the fused group and the following commands.
+        """
+        first = IncrementCommand()
+        first.handle = MagicMock(return_value=False)
+        second = IncrementCommand()
+        second.handle = MagicMock(return_value=True)
+
+        pipeline = Pipeline()
+        pipeline.add_command(first)
+        pipeline.add_command(second)
+        pipeline.run()
+
+        first.handle.assert_called_once()
+        second.handle.assert_not_called()
@@ -38,6 +38,7 @@ class PipelineTest(TestCase):
         sink.cleanup = MagicMock()
         command.setup = MagicMock()
         command.cleanup = MagicMock()
+        command.failed = MagicMock()
 
         # Create a pipeline and execute it.
         pipeline = Pipeline(source, sink)
@@ -51,6 +52,7 @@ class PipelineTest(TestCase):
         sink.cleanup.assert_called()
         command.setup.assert_called()
         command.cleanup.assert_called()
+        command.failed.assert_not_called()
 
     def test_should_not_issue_commands_after_skip_command(self):
         """
@@ -88,6 +90,7 @@ class PipelineTest(TestCase):
         cmd1.cleanup = MagicMock()
         cmd2 = EmptyCommand()
         cmd2.cleanup = MagicMock()
+        cmd2.failed = MagicMock()
 
         # Create a pipeline and execute it.
         pipeline = Pipeline()
@@ -103,6 +106,7 @@ class PipelineTest(TestCase):
         # lifecycle methods we issued.
         cmd1.cleanup.assert_called_once()
         cmd2.cleanup.assert_called_once()
+        self.assertIsInstance(cmd2.failed.call_args[0][0], EnvironmentError)
 
     def test_should_provide_requirements_to_command(self):
         """
@@ -0,0 +1,108 @@
+from typing import List
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+
+from pyper.pipeline import *
+from pyper.pipeline.source import SimpleListSource
+from pyper.pipeline.test.pipeline_test_helper import EmptyCommand
+
+
+class ProgressTest(TestCase):
+
+    def test_should_report_counts_on_finish(self):
+        """
+        Test that a final report includes processed and skipped cycles as well as the source size.
+        """
+        reports: List[ProgressReport] = []
+
+        pipeline = Pipeline(SimpleListSource("value", [1, 2, 3, 4, 5]),
+                            progress=ProgressReporter(reports.append))
+        pipeline.add_command(EmptyCommand(lambda ctx: ctx.get("value") % 2 == 1, requires={"value"}))
+        pipeline.run()
+
+        report = reports[-1]
+        self.assertEqual(3, report.processed)
+        self.assertEqual(2, report.skipped)
+        self.assertEqual(0, report.failed)
+        self.assertEqual(5, report.estimated_size)
+
+    def test_should_count_failure(self):
+        """
+        Test that a cycle failing with an exception is counted.
+        """
+        reports: List[ProgressReport] = []
+
+        # noinspection PyUnusedLocal
+        def error(ctx):
+            raise EnvironmentError()
+
+        pipeline = Pipeline(progress=ProgressReporter(reports.append))
+        pipeline.add_command(EmptyCommand(error))
+        with self.assertRaises(EnvironmentError):
+            pipeline.run()
+
+        self.assertEqual(1, reports[-1].failed)
+
+    def test_should_report_periodically_with_eta(self):
+        """
+        Test that reports are issued at the configured interval, with throughput and ETA.
+        """
+        reports: List[ProgressReport] = []
+        reporter = ProgressReporter(reports.append, interval=1.0)
+
+        with patch("pyper.pipeline.progress.time.monotonic") as clock:
+            clock.return_value = 100.0
+            reporter.start(estimated_size=100)
+
+            # 19 cycles within a second -- below report interval.
+            clock.return_value = 100.5
+            for _ in range(19):
+                reporter.update(True)
+            self.assertEqual(0, len(reports))
+
+            # One more cycle, two seconds after start.
+            clock.return_value = 102.0
+            reporter.update(True)
+
+            # Next report is due only one interval later.
+            reporter.update(True)
+
+        self.assertEqual(1, len(reports))
+        self.assertEqual(20, reports[0].processed)
+        self.assertAlmostEqual(10.0, reports[0].throughput)
+        self.assertAlmostEqual(8.0, reports[0].eta)
+
+    def test_should_report_slow_cycles_on_time(self):
+        """
+        Test that a report is issued once the interval elapses, even after a single (slow) cycle.
+        """
+        reports: List[ProgressReport] = []
+        reporter = ProgressReporter(reports.append, interval=1.0)
+
+        with patch("pyper.pipeline.progress.time.monotonic") as clock:
+            clock.return_value = 0.0
+            reporter.start()
+
+            clock.return_value = 600.0
+            reporter.update(True)
+
+        self.assertEqual(1, len(reports))
+
+    def test_should_issue_cleanup_when_report_fails(self):
+        """
+        Test that cleanup callbacks are issued even if the progress callback raises an exception.
+        """
+
+        # noinspection PyUnusedLocal
+        def failing_callback(report):
+            raise EnvironmentError()
+
+        command = EmptyCommand()
+        command.cleanup = MagicMock()
+        pipeline = Pipeline(progress=ProgressReporter(failing_callback))
+        pipeline.add_command(command)
+
+        with self.assertRaises(EnvironmentError):
+            pipeline.run()
+
+        command.cleanup.assert_called_once()
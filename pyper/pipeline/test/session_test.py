@@ -0,0 +1,265 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from pyper.exceptions import IllegalStateError, IllegalArgumentError
+from pyper.pipeline import *
+from pyper.pipeline.exceptions import AbortPipeline
+from pyper.pipeline.test.pipeline_test_helper import EmptyCommand
+
+
+class CustomContext(Context):
+    """
+    Custom context that includes a 'result' property.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.result = None
+
+
+class CustomContextProvider(PipelineContextProvider[CustomContext]):
+
+    def create_context(self) -> CustomContext:
+        return CustomContext()
+
+
+# noinspection PyMethodMayBeStatic
+class PipelineSessionTest(TestCase):
+
+    def _create_pipeline(self, command: Command) -> Pipeline:
+        """
+        Create a pipeline with an 'item' input, a sink providing the 'result' property and a given command.
+        """
+        pipeline = Pipeline(sink=Sink("result"), context_provider=CustomContextProvider(), inputs="item")
+        pipeline.add_command(command)
+        return pipeline
+
+    def test_should_process_pushed_items(self):
+        """
+        Test that items pushed into a session are processed and per-item results are returned.
+        """
+
+        def double(ctx: CustomContext):
+            ctx.result = ctx.get("item") * 2
+            return True
+
+        pipeline = self._create_pipeline(EmptyCommand(double, requires={"item"}))
+        with pipeline.session("item") as s:
+            self.assertEqual(4, s.process(2))
+            self.assertEqual([2, 6, 10], s.process_many([1, 3, 5]))
+
+    def test_should_issue_callbacks_once_per_session(self):
+        """
+        Test that setup and cleanup callbacks are issued once, regardless of the number of processed items.
+        """
+        command = EmptyCommand()
+        command.setup = MagicMock()
+        command.cleanup = MagicMock()
+        command.handle = MagicMock(return_value=True)
+
+        pipeline = self._create_pipeline(command)
+        with pipeline.session("item") as s:
+            s.process_many(range(10))
+
+        command.setup.assert_called_once()
+        command.cleanup.assert_called_once()
+
+    def test_should_stop_processing_many_on_abort(self):
+        """
+        Test that processing several items stops once a command aborts the pipeline, keeping results computed so far.
+        """
+
+        def double_or_abort(ctx: CustomContext):
+            if ctx.get("item") == 2:
+                raise AbortPipeline()
+            ctx.result = ctx.get("item") * 2
+            return True
+
+        pipeline = self._create_pipeline(EmptyCommand(double_or_abort))
+        with pipeline.session() as s:
+            self.assertEqual([2, None], s.process_many([1, 2, 3]))
+            self.assertFalse(s.active)
+
+    def test_should_derive_property_from_inputs(self):
+        """
+        Test that a session sets items into the pipeline's single input, and rejects properties not provided.
+        """
+
+        def copy(ctx: CustomContext):
+            ctx.result = ctx.get("item")
+            return True
+
+        pipeline = self._create_pipeline(EmptyCommand(copy))
+        with pipeline.session() as s:
+            self.assertEqual(7, s.process(7))
+
+        with self.assertRaises(IllegalArgumentError):
+            pipeline.session("other")
+
+    def test_should_return_per_cycle_result_of_accumulating_sink(self):
+        """
+        Test that a sink accumulating results across cycles can provide per-cycle results.
+        """
+
+        class SumSink(Sink):
+            def __init__(self):
+                super().__init__()
+                self._last = None
+
+            def handle(self, context: Context):
+                self._last = context.get("item")
+                self._result = (self._result or 0) + self._last
+
+            def get_cycle_result(self) -> object:
+                return self._last
+
+        sink = SumSink()
+        with Pipeline(sink=sink, inputs="item").session() as s:
+            self.assertEqual([1, 2, 3], s.process_many([1, 2, 3]))
+
+        self.assertEqual(6, sink.get_result())
+        self.assertEqual(10, command.handle.call_count)
+
+    def test_should_reject_items_when_inactive(self):
+        """
+        Test that processing an item outside an active session is rejected.
+        """
+        session = self._create_pipeline(EmptyCommand()).session("item")
+
+        with self.assertRaises(IllegalStateError):
+            session.process(1)
+
+        with session:
+            pass
+
+        with self.assertRaises(IllegalStateError):
+            session.process(1)
+
+    def test_should_close_session_on_abort(self):
+        """
+        Test that a command raising 'AbortPipeline' closes the session.
+        """
+
+        # noinspection PyUnusedLocal
+        def abort(ctx):
+            raise AbortPipeline()
+
+        command = EmptyCommand(abort)
+        command.cleanup = MagicMock()
+
+        with self._create_pipeline(command).session("item") as s:
+            self.assertIsNone(s.process(1))
+            self.assertFalse(s.active)
+            command.cleanup.assert_called_once()
+
+    def test_should_stop_processing_many_on_abort(self):
+        """
+        Test that processing several items stops once a command aborts the pipeline, keeping results computed so far.
+        """
+
+        def double_or_abort(ctx: CustomContext):
+            if ctx.get("item") == 2:
+                raise AbortPipeline()
+            ctx.result = ctx.get("item") * 2
+            return True
+
+        pipeline = self._create_pipeline(EmptyCommand(double_or_abort))
+        with pipeline.session() as s:
+            self.assertEqual([2, None], s.process_many([1, 2, 3]))
+            self.assertFalse(s.active)
+
+    def test_should_derive_property_from_inputs(self):
+        """
+        Test that a session sets items into the pipeline's single input, and rejects properties not provided.
+        """
+
+        def copy(ctx: CustomContext):
+            ctx.result = ctx.get("item")
+            return True
+
+        pipeline = self._create_pipeline(EmptyCommand(copy))
+        with pipeline.session() as s:
+            self.assertEqual(7, s.process(7))
+
+        with self.assertRaises(IllegalArgumentError):
+            pipeline.session("other")
+
+    def test_should_return_per_cycle_result_of_accumulating_sink(self):
+        """
+        Test that a sink accumulating results across cycles can provide per-cycle results.
+        """
+
+        class SumSink(Sink):
+            def __init__(self):
+                super().__init__()
+                self._last = None
+
+            def handle(self, context: Context):
+                self._last = context.get("item")
+                self._result = (self._result or 0) + self._last
+
+            def get_cycle_result(self) -> object:
+                return self._last
+
+        sink = SumSink()
+        with Pipeline(sink=sink, inputs="item").session() as s:
+            self.assertEqual([1, 2, 3], s.process_many([1, 2, 3]))
+
+        self.assertEqual(6, sink.get_result())
+
+        command.cleanup.assert_called_once()
+
+    def test_should_stop_processing_many_on_abort(self):
+        """
+        Test that processing several items stops once a command aborts the pipeline, keeping results computed so far.
+        """
+
+        def double_or_abort(ctx: CustomContext):
+            if ctx.get("item") == 2:
+                raise AbortPipeline()
+            ctx.result = ctx.get("item") * 2
+            return True
+
+        pipeline = self._create_pipeline(EmptyCommand(double_or_abort))
+        with pipeline.session() as s:
+            self.assertEqual([2, None], s.process_many([1, 2, 3]))
+            self.assertFalse(s.active)
+
+    def test_should_derive_property_from_inputs(self):
+        """
+        Test that a session sets items into the pipeline's single input, and rejects properties not provided.
+        """
+
+        def copy(ctx: CustomContext):
+            ctx.result = ctx.get("item")
+            return True
+
+        pipeline = self._create_pipeline(EmptyCommand(copy))
+        with pipeline.session() as s:
+            self.assertEqual(7, s.process(7))
+
+        with self.assertRaises(IllegalArgumentError):
+            pipeline.session("other")
+
+    def test_should_return_per_cycle_result_of_accumulating_sink(self):
+        """
+        Test that a sink accumulating results across cycles can provide per-cycle results.
+        """
+
+        class SumSink(Sink):
+            def __init__(self):
+                super().__init__()
+                self._last = None
+
+            def handle(self, context: Context):
+                self._last = context.get("item")
+                self._result = (self._result or 0) + self._last
+
+            def get_cycle_result(self) -> object:
+                return self._last
+
+        sink = SumSink()
+        with Pipeline(sink=sink, inputs="item").session() as s:
+            self.assertEqual([1, 2, 3], s.process_many([1, 2, 3]))
+
+        self.assertEqual(6, sink.get_result())
@@ -50,3 +50,9 @@ class SourceTest(TestCase):
         results: int = pipeline.run()
 
         self.assertEqual(sum(value_list), results)
+
+    def test_should_estimate_list_size(self):
+        """
+        Test that a list source provides its exact size.
+        """
+        self.assertEqual(3, SimpleListSource("value", [1, 2, 3]).estimated_size)
@@ -0,0 +1,90 @@
+import sys
+from unittest import TestCase
+
+from pyper.exceptions import IllegalArgumentError
+from pyper.pipeline import *
+from pyper.pipeline.test.pipeline_test_helper import EmptyCommand
+
+
+class TotalSink(Sink):
+    """
+    A sink providing the 'total' attribute.
+    """
+
+    def handle(self, context: Context):
+        self._result = context.get("total")
+
+
+def add_to_total(ctx: Context):
+    ctx.set("total", ctx.get("total", 0) + ctx.get("value"))
+    return True
+
+
+class SpecTest(TestCase):
+
+    def test_should_build_pipeline_from_spec(self):
+        """
+        Test that a pipeline built from a spec executes all its components.
+        """
+        definition = {
+            "source": {"class": "pyper.pipeline.source.SimpleListSource", "args": ["value", [1, 2, 3]]},
+            "sink": "pyper.pipeline.test.spec_test:TotalSink",
+            "commands": [
+                {"class": EmptyCommand,
+                 "kwargs": {"handler": add_to_total, "requires": {"value"}, "provides": {"total"}}}
+            ]
+        }
+        spec = PipelineSpec(definition)
+
+        self.assertFalse(spec.validated)
+        self.assertEqual(6, spec.build().run())
+        self.assertTrue(spec.validated)
+
+        # Validation is cached per definition, so another spec with an equal definition is validated as well.
+        self.assertTrue(PipelineSpec(dict(definition)).validated)
+
+        # Each build creates new component instances.
+        self.assertIsNot(spec.build(), spec.build())
+
+    def test_should_import_modules_lazily(self):
+        """
+        Test that component modules are imported on build rather than upon spec construction.
+        """
+        module_name = "pyper.pipeline.test.spec_test_helper"
+        sys.modules.pop(module_name, None)
+
+        spec = PipelineSpec({"commands": [module_name + ".LazyCommand"]})
+        self.assertNotIn(module_name, sys.modules)
+
+        spec.build()
+        self.assertIn(module_name, sys.modules)
+
+    def test_should_reject_invalid_definition(self):
+        """
+        Test that structural errors are detected upon spec construction.
+        """
+        with self.assertRaises(IllegalArgumentError):
+            PipelineSpec({"source": "a.B", "unknown": 1})
+
+        with self.assertRaises(IllegalArgumentError):
+            PipelineSpec({"commands": [{"class": "a.B", "args": 1}]})
+
+    def test_should_reject_unknown_class(self):
+        """
+        Test that an unresolvable class name is reported on build.
+        """
+        spec = PipelineSpec({"commands": ["pyper.pipeline.command.NoSuchCommand"]})
+
+        with self.assertRaises(IllegalArgumentError):
+            spec.build()
+
+    def test_should_fail_on_missing_requirement(self):
+        """
+        Test that requirements are validated when building a pipeline.
+        """
+        spec = PipelineSpec({"commands": [{"class": EmptyCommand, "kwargs": {"requires": {"name"}}}]})
+
+        with self.assertRaises(MissingRequirementsException):
+            spec.build()
+
+        self.assertFalse(spec.validated)
@@ -0,0 +1,5 @@
+from pyper.pipeline.test.pipeline_test_helper import EmptyCommand
+
+
+class LazyCommand(EmptyCommand):
+    """ A command living in its own module, to test lazy imports of pipeline specs. """
@@ -0,0 +1,78 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyper.exceptions import IllegalArgumentError
+from pyper.pipeline.tuning import AdaptiveController
+
+
+class AdaptiveControllerTest(TestCase):
+
+    def setUp(self):
+        self._patcher = patch("pyper.pipeline.tuning.time.monotonic", return_value=0.0)
+        self._clock = self._patcher.start()
+
+    def tearDown(self):
+        self._patcher.stop()
+
+    def _observe(self, controller: AdaptiveController, completed: int, queue_depth: int = 1000):
+        """
+        Advance the clock by one interval (1 second) and observe.
+        """
+        self._clock.return_value += 1.0
+        return controller.observe(completed, queue_depth)
+
+    def test_should_add_workers_while_throughput_improves(self):
+        """
+        Test that workers are added as long as throughput improves, and removed once it degrades.
+        """
+        controller = AdaptiveController(min_workers=1, max_workers=4, interval=1.0)
+        controller.start(workers=1, batch_size=1)
+
+        self.assertEqual(2, self._observe(controller, 10).workers)
+        self.assertEqual(3, self._observe(controller, 30).workers)
+
+        # Throughput degraded -- direction is reversed.
+        self.assertEqual(2, self._observe(controller, 35).workers)
+
+    def test_should_not_decide_before_interval_elapses(self):
+        """
+        Test that no decision is made before the interval elapses.
+        """
+        controller = AdaptiveController(interval=1.0)
+        controller.start(workers=1, batch_size=1)
+
+        self.assertFalse(controller.due)
+        self.assertIsNone(controller.observe(100, 1000))
+
+    def test_should_tune_batch_size_on_plateau(self):
+        """
+        Test that the controller switches to tuning batch size once workers reach a plateau.
+        """
+        controller = AdaptiveController(min_workers=1, max_workers=1, max_batch_size=64, interval=1.0)
+        controller.start(workers=1, batch_size=4)
+
+        # First measurement: workers are at maximum, hence no change.
+        self.assertIsNone(self._observe(controller, 10))
+
+        # Plateau: switch to batch size.
+        self.assertIsNone(self._observe(controller, 20))
+
+        decision = self._observe(controller, 40)
+        self.assertEqual(8, decision.batch_size)
+        self.assertEqual(1, decision.workers)
+
+    def test_should_not_add_workers_when_queue_is_drained(self):
+        """
+        Test that workers are not added when there is no work waiting for them.
+        """
+        controller = AdaptiveController(min_workers=1, max_workers=4, interval=1.0)
+        controller.start(workers=1, batch_size=1)
+
+        self.assertIsNone(self._observe(controller, 10, queue_depth=0))
+
+    def test_should_reject_invalid_bounds(self):
+        """
+        Test that invalid bounds are rejected.
+        """
+        with self.assertRaises(IllegalArgumentError):
+            AdaptiveController(min_workers=4, max_workers=2)
@@ -0,0 +1,193 @@
+import logging
+import os
+import time
+from typing import NamedTuple, Optional
+
+from pyper.exceptions import IllegalArgumentError
+
+__all__ = ['TuningDecision', 'AdaptiveController']
+
+
+class TuningDecision(NamedTuple):
+    """
+    New execution settings decided by an 'AdaptiveController'.
+    """
+
+    # Number of concurrent workers.
+    workers: int
+
+    # Number of items handed to a worker at once.
+    batch_size: int
+
+    # Throughput (items per second) measured during the last interval.
+    throughput: float
+
+    # Human-readable reason for the decision.
+    reason: str
+
+
+class AdaptiveController:
+    """
+    Adjusts concurrency (number of workers) and batch size, within configured bounds, according to live throughput.
+
+    The controller hill-climbs, tuning one setting at a time: at the end of every interval it measures the throughput
+    and compares it to the previous interval. On improvement, it keeps moving the current setting in the same
+    direction; on degradation, it reverses direction; on a plateau, it switches to tuning the other setting. Workers
+    are changed additively and batch size multiplicatively. Queue depth bounds the decisions: workers are not
+    added while the queue is drained (the producer is the bottleneck), and batches never exceed the queue's share
+    per worker.
+
+    All decisions are logged.
+    """
+
+    def __init__(self,
+                 min_workers: int = 1,
+                 max_workers: Optional[int] = None,
+                 min_batch_size: int = 1,
+                 max_batch_size: int = 1024,
+                 interval: float = 5.0,
+                 tolerance: float = 0.05,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Class initializer.
+
+        :param min_workers: Minimal number of workers.
+        :param max_workers: Maximal number of workers. Defaults to number of CPUs.
+        :param min_batch_size: Minimal batch size.
+        :param max_batch_size: Maximal batch size.
+        :param interval: Number of seconds between two decisions.
+        :param tolerance: Relative change in throughput considered as noise.
+        :param logger: Logger to log decisions to. Defaults to this module's logger.
+        """
+        max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        if not 1 <= min_workers <= max_workers:
+            raise IllegalArgumentError(f"Invalid workers range: [{min_workers}, {max_workers}].")
+        if not 1 <= min_batch_size <= max_batch_size:
+            raise IllegalArgumentError(f"Invalid batch size range: [{min_batch_size}, {max_batch_size}].")
+        if interval <= 0:
+            raise IllegalArgumentError(f"Invalid interval: {interval}. Expected a positive number.")
+
+        self._min_workers: int = min_workers
+        self._max_workers: int = max_workers
+        self._min_batch_size: int = min_batch_size
+        self._max_batch_size: int = max_batch_size
+        self._interval: float = interval
+        self._tolerance: float = tolerance
+        self._logger: logging.Logger = logger if logger else logging.getLogger(__name__)
+
+        # Current settings.
+        self._workers: int = min_workers
+        self._batch_size: int = min_batch_size
+
+        # Setting currently tuned ('workers' or 'batch_size') and direction of last change (+1 or -1).
+        self._knob: str = "workers"
+        self._direction: int = 1
+
+        # Time and number of completed items at the beginning of current interval, and throughput of last interval.
+        self._last_time: float = 0.0
+        self._last_completed: int = 0
+        self._last_throughput: Optional[float] = None
+
+    @property
+    def workers(self) -> int:
+        """
+        :return: Current number of workers.
+        """
+        return self._workers
+
+    @property
+    def batch_size(self) -> int:
+        """
+        :return: Current batch size.
+        """
+        return self._batch_size
+
+    @property
+    def due(self) -> bool:
+        """
+        :return: True if current interval has elapsed, so the next call to 'observe' may decide on new settings.
+        """
+        return time.monotonic() - self._last_time >= self._interval
+
+    def start(self, workers: int, batch_size: int):
+        """
+        Called when execution starts, with the initial settings (clamped to the configured bounds).
+
+        :param workers: Initial number of workers.
+        :param batch_size: Initial batch size.
+        """
+        self._workers = self._clamp(workers, self._min_workers, self._max_workers)
+        self._batch_size = self._clamp(batch_size, self._min_batch_size, self._max_batch_size)
+        self._knob = "workers"
+        self._direction = 1
+        self._last_time = time.monotonic()
+        self._last_completed = 0
+        self._last_throughput = None
+
+    def observe(self, completed: int, queue_depth: int) -> Optional[TuningDecision]:
+        """
+        Called periodically during execution. Once per interval, decides on new settings.
+
+        :param completed: Total number of items completed so far.
+        :param queue_depth: Number of items waiting to be processed (including items in process).
+        :return: A decision, if settings have changed. Otherwise, None.
+        """
+        now: float = time.monotonic()
+        if now - self._last_time < self._interval:
+            return None
+
+        throughput: float = (completed - self._last_completed) / (now - self._last_time)
+        previous: Optional[float] = self._last_throughput
+        self._last_time = now
+        self._last_completed = completed
+        self._last_throughput = throughput
+
+        if previous is None:
+            reason = f"initial throughput: {throughput:.1f} items/sec"
+        elif throughput > previous * (1 + self._tolerance):
+            reason = f"throughput improved ({previous:.1f} -> {throughput:.1f} items/sec)"
+        elif throughput < previous * (1 - self._tolerance):
+            reason = f"throughput degraded ({previous:.1f} -> {throughput:.1f} items/sec)"
+            self._direction = -self._direction
+        else:
+            # Plateau: keep current settings, tune the other setting on next interval.
+            self._knob = "batch_size" if self._knob == "workers" else "workers"
+            self._direction = 1
+            return None
+
+        workers, batch_size = self._step(queue_depth)
+        if workers == self._workers and batch_size == self._batch_size:
+            return None
+
+        decision = TuningDecision(workers, batch_size, throughput, f"{reason}, queue depth: {queue_depth}")
+        self._logger.info(f"Tuning: workers {self._workers} -> {workers}, batch size {self._batch_size} -> "
+                          f"{batch_size}: {decision.reason}.")
+
+        self._workers = workers
+        self._batch_size = batch_size
+        return decision
+
+    def _step(self, queue_depth: int):
+        """
+        Move the currently tuned setting one step in the current direction, within bounds.
+
+        :return: Tuple of new number of workers and new batch size.
+        """
+        workers: int = self._workers
+        batch_size: int = self._batch_size
+
+        if self._knob == "workers":
+            # Adding workers does not help when the queue is drained -- the producer is the bottleneck.
+            if self._direction > 0 and queue_depth == 0:
+                return workers, batch_size
+            workers = self._clamp(workers + self._direction, self._min_workers, self._max_workers)
+        else:
+            batch_size = batch_size * 2 if self._direction > 0 else batch_size // 2
+
+        # Batches larger than each worker's share of the queue leave other workers idle.
+        batch_size = min(batch_size, max(queue_depth // workers, 1))
+        return workers, self._clamp(batch_size, self._min_batch_size, self._max_batch_size)
+
+    @staticmethod
+    def _clamp(value: int, lower: int, upper: int) -> int:
+        return max(lower, min(value, upper))
@@ -8,6 +8,12 @@ description = 'A simple (yet sophisticated) pipeline implementation for Python.'
 # Package dependencies
 dependencies = []
 
+# Optional dependencies
+extras = {
+    'columnar': ['numpy'],
+    'parquet': ['numpy', 'pyarrow'],
+}
+
 # Package setup
 setup(
     name=name,
@@ -15,6 +21,7 @@ setup(
     description=description,
     packages=find_packages(),
     install_requires=dependencies,
+    extras_require=extras,
     download_url="https://github.com/guynir/pyper/archive/refs/tags/0.9.0.tar.gz",
     license='MIT',
     author='Guy Raz Nir',